@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark routing shortlist against synthetic registries of 10 to 5,000 automations.
+
+Reports index build time, shortlist latency and routing prompt size with and
+without shortlisting. Prompt size is what drives LLM latency and cost.
+
+    python3 scripts/bench_routing.py
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from routing import RoutingIndex, shortlist, DEFAULT_TOP_K
+
+SIZES = [10, 100, 500, 1000, 5000]
+QUERIES = [
+    "find leads on reddit and email them",
+    "send bulk email to our newsletter list",
+    "post the product launch on linkedin",
+    "generate a proposal for acme corp",
+    "track competitor pricing changes",
+]
+
+CHANNELS = ["email", "reddit", "linkedin", "twitter", "slack", "crm", "sheets", "blog", "ads", "sms"]
+ACTIONS = ["send", "find", "sync", "post", "track", "generate", "score", "enrich", "export", "schedule"]
+OBJECTS = ["leads", "campaign", "proposal", "report", "newsletter", "pricing", "contacts", "content"]
+
+
+def synthetic_registry(size, seed=42):
+    rng = random.Random(seed)
+    automations = {}
+    for i in range(size):
+        action, channel, obj = rng.choice(ACTIONS), rng.choice(CHANNELS), rng.choice(OBJECTS)
+        automations[f"{action}_{channel}_{obj}_{i}"] = {
+            "description": f"{action.capitalize()} {obj} via {channel} for marketing team {i}",
+            "webhook_path": f"/webhook/{action}-{channel}-{obj}-{i}",
+        }
+    return automations
+
+
+def prompt_chars(automations):
+    return len("\n".join(f"- {name}: {data['description']}" for name, data in automations.items()))
+
+
+def main():
+    print(f"{'size':>6} {'build ms':>9} {'lookup ms':>10} {'full prompt':>12} {'top-k prompt':>13}")
+    for size in SIZES:
+        automations = synthetic_registry(size)
+
+        started = time.perf_counter()
+        index = RoutingIndex(automations)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        rounds = 200
+        started = time.perf_counter()
+        for i in range(rounds):
+            candidates = shortlist(automations, index, QUERIES[i % len(QUERIES)], DEFAULT_TOP_K)
+        lookup_ms = (time.perf_counter() - started) * 1000 / rounds
+
+        shortlisted = sum(prompt_chars(shortlist(automations, index, q, DEFAULT_TOP_K)) for q in QUERIES) // len(QUERIES)
+        print(f"{size:>6} {build_ms:>9.1f} {lookup_ms:>10.3f} {prompt_chars(automations):>12} {shortlisted:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Minimal in-memory mock of the n8n REST API for trying sync/provision locally.
+
+Supports GET/POST /api/v1/workflows (with limit/cursor paging),
+GET/PUT /api/v1/workflows/<id> and POST /api/v1/workflows/<id>/activate.
+
+    python3 scripts/mock_n8n.py 5679
+    N8N_BASE_URL=http://localhost:5679 N8N_API_KEY=test python3 src/n8n_api.py provision
+"""
+import sys
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+READ_ONLY_FIELDS = {"id", "active", "createdAt", "updatedAt", "tags"}
+
+
+class MockN8n:
+    def __init__(self):
+        self.workflows = {}
+        self.next_id = 1
+        self.writes = 0     # successful POST/PUT requests, so tests can check reruns write nothing
+        self.lock = threading.Lock()
+
+    def save(self, workflow_id, body):
+        now = datetime.now().isoformat()
+        with self.lock:
+            if workflow_id is None:
+                workflow_id = str(self.next_id)
+                self.next_id += 1
+                self.workflows[workflow_id] = {"id": workflow_id, "active": False, "createdAt": now}
+            workflow = self.workflows[workflow_id]
+            workflow.update({k: v for k, v in body.items() if k not in READ_ONLY_FIELDS})
+            workflow["updatedAt"] = now
+            self.writes += 1
+            return dict(workflow)
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def reply(self, code, body):
+            data = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def route(self):
+            if not self.headers.get("X-N8N-API-KEY"):
+                self.reply(401, {"message": "'X-N8N-API-KEY' header required"})
+                return None
+            url = urlparse(self.path)
+            parts = url.path.strip("/").split("/")
+            if parts[:3] != ["api", "v1", "workflows"]:
+                self.reply(404, {"message": "not found"})
+                return None
+            return parts[3:], parse_qs(url.query)
+
+        def body(self):
+            length = int(self.headers.get("Content-Length", 0))
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self):
+            routed = self.route()
+            if routed is None:
+                return
+            rest, query = routed
+            if not rest:
+                limit = int(query.get("limit", ["100"])[0])
+                offset = int(query.get("cursor", ["0"])[0])
+                with state.lock:
+                    workflows = sorted(state.workflows.values(), key=lambda w: int(w["id"]))
+                page = workflows[offset:offset + limit]
+                next_cursor = str(offset + limit) if offset + limit < len(workflows) else None
+                self.reply(200, {"data": page, "nextCursor": next_cursor})
+            elif rest[0] in state.workflows:
+                self.reply(200, state.workflows[rest[0]])
+            else:
+                self.reply(404, {"message": "Not Found"})
+
+        def do_POST(self):
+            routed = self.route()
+            if routed is None:
+                return
+            rest, _ = routed
+            if not rest:
+                body = self.body()
+                if "active" in body:
+                    self.reply(400, {"message": "request/body/active is read-only"})
+                    return
+                self.reply(200, state.save(None, body))
+            elif len(rest) == 2 and rest[1] == "activate" and rest[0] in state.workflows:
+                with state.lock:
+                    state.workflows[rest[0]]["active"] = True
+                    state.writes += 1
+                    workflow = dict(state.workflows[rest[0]])
+                self.reply(200, workflow)
+            else:
+                self.reply(404, {"message": "Not Found"})
+
+        def do_PUT(self):
+            routed = self.route()
+            if routed is None:
+                return
+            rest, _ = routed
+            if len(rest) == 1 and rest[0] in state.workflows:
+                self.reply(200, state.save(rest[0], self.body()))
+            else:
+                self.reply(404, {"message": "Not Found"})
+
+    return Handler
+
+
+def serve(port=0):
+    """Start the mock on a background thread; returns (server, state)"""
+    state = MockN8n()
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 5679
+    server, _ = serve(port)
+    print(f"Mock n8n API on http://127.0.0.1:{server.server_port}/api/v1 (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
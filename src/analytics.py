@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import json
+import threading
 from datetime import datetime
 from styling import *
 
@@ -14,10 +15,20 @@ class Analytics:
             "automations_used": {},
             "workflows_used": {},
             "parameters_extracted": 0,
+            "duplicates_suppressed": 0,
+            "registry_reloads": 0,
+            "registry_reload_time": 0,
+            "registry_size": 0,
+            "llm_calls": {},
+            "plan_cache_hits": 0,
+            "plan_cache_misses": 0,
+            "llm_budget_exceeded": 0,
             "errors": []
         }
         self.start_time = None
         self.end_time = None
+        # LLM calls are also tracked from the background analysis pool
+        self.lock = threading.Lock()
     
     def start_tracking(self):
         """Start tracking execution"""
@@ -47,6 +58,39 @@ class Analytics:
         if params and any(params.values()):
             self.metrics["parameters_extracted"] += len([v for v in params.values() if v])
     
+    def track_duplicates(self, count):
+        """Track leads dropped because they were already contacted"""
+        self.metrics["duplicates_suppressed"] += count
+    
+    def track_reload(self, seconds, automation_count):
+        """Track a hot reload of the automation registry"""
+        self.metrics["registry_reloads"] += 1
+        self.metrics["registry_reload_time"] += seconds
+        self.metrics["registry_size"] = automation_count
+    
+    def track_llm_call(self, call_site, model, prompt_tokens, completion_tokens, seconds, queue_wait=0):
+        """Track tokens, latency and rate-limit queue wait of one LLM call, per call site"""
+        with self.lock:
+            site = self.metrics["llm_calls"].setdefault(call_site, {
+                "model": model, "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency": 0, "queue_wait": 0
+            })
+            site["model"] = model
+            site["calls"] += 1
+            site["prompt_tokens"] += prompt_tokens
+            site["completion_tokens"] += completion_tokens
+            site["latency"] += seconds
+            site["queue_wait"] += queue_wait
+    
+    def track_budget_exceeded(self, message):
+        """Track a request stopped by the daily LLM token budget"""
+        with self.lock:
+            self.metrics["llm_budget_exceeded"] += 1
+            self.metrics["errors"].append(message)
+    
+    def track_plan_cache(self, hit):
+        """Track a plan cache lookup"""
+        self.metrics["plan_cache_hits" if hit else "plan_cache_misses"] += 1
+    
     def track_step(self):
         """Track workflow step"""
         self.metrics["total_steps"] += 1
@@ -61,6 +105,8 @@ class Analytics:
     def display_analytics(self):
         """Display comprehensive analytics"""
         exec_time = self.get_execution_time()
+        with self.lock:
+            llm_calls = {call_site: dict(site) for call_site, site in self.metrics["llm_calls"].items()}
         
         print("\n" + "="*70)
         print(header("📊 TRACKING & ANALYTICS"))
@@ -95,10 +141,38 @@ class Analytics:
             workflow_data = [[name, str(count)] for name, count in sorted(self.metrics["workflows_used"].items(), key=lambda x: x[1], reverse=True)]
             print(table(["Workflow", "Count"], workflow_data))
         
+        # LLM Usage
+        if llm_calls:
+            print(f"\n{bold('🧠 LLM USAGE')}")
+            llm_data = [
+                [call_site, site["model"], str(site["calls"]), str(site["prompt_tokens"]),
+                 str(site["completion_tokens"]), f"{site['latency'] / site['calls']:.2f}s",
+                 f"{site['queue_wait']:.2f}s"]
+                for call_site, site in llm_calls.items()
+            ]
+            print(table(["Call Site", "Model", "Calls", "Prompt Tokens", "Completion Tokens", "Avg Latency", "Queue Wait"], llm_data))
+        
+        # Plan Cache
+        lookups = self.metrics["plan_cache_hits"] + self.metrics["plan_cache_misses"]
+        if lookups > 0:
+            hit_rate = self.metrics["plan_cache_hits"] / lookups * 100
+            cache_detail = f"({self.metrics['plan_cache_hits']}/{lookups} lookups)"
+            print(f"\n{bold('♻ PLAN CACHE HIT RATE:')} {hit_rate:.1f}% {dim(cache_detail)}")
+        
         # Parameters Extracted
         if self.metrics["parameters_extracted"] > 0:
             print(f"\n{bold('📝 PARAMETERS EXTRACTED:')} {self.metrics['parameters_extracted']}")
         
+        # Duplicate Leads
+        if self.metrics["duplicates_suppressed"] > 0:
+            print(f"\n{bold('🧹 DUPLICATE LEADS SUPPRESSED:')} {self.metrics['duplicates_suppressed']}")
+        
+        # Registry Reloads
+        if self.metrics["registry_reloads"] > 0:
+            reload_ms = self.metrics["registry_reload_time"] * 1000
+            reload_detail = f"({reload_ms:.1f}ms total, {self.metrics['registry_size']} automations)"
+            print(f"\n{bold('🔄 REGISTRY RELOADS:')} {self.metrics['registry_reloads']} {dim(reload_detail)}")
+        
         # Errors
         if self.metrics["errors"]:
             print(f"\n{bold('❌ ERRORS ENCOUNTERED:')}")
@@ -115,6 +189,13 @@ class Analytics:
         if exec_time > 30:
             insights.append(f"⏱ Execution took {exec_time:.1f}s - consider optimizing workflows")
         
+        queue_wait = sum(site["queue_wait"] for site in llm_calls.values())
+        if queue_wait > 1:
+            insights.append(f"🚦 {queue_wait:.1f}s spent waiting on LLM rate limits")
+        
+        if self.metrics["llm_budget_exceeded"] > 0:
+            insights.append(f"🛑 {self.metrics['llm_budget_exceeded']} request(s) stopped by the daily LLM token budget")
+        
         if self.metrics["total_steps"] > 5:
             insights.append(f"🔗 Complex workflow with {self.metrics['total_steps']} steps executed")
         
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Local catalog of automations synced from n8n, indexed for fast lookup"""
+import os
+import re
+import json
+from datetime import datetime
+
+DEFAULT_CATALOG_PATH = "config/catalog.json"
+WEBHOOK_NODE = "n8n-nodes-base.webhook"
+STICKY_NOTE_NODE = "n8n-nodes-base.stickyNote"
+
+STOPWORDS = {"the", "and", "for", "with", "from", "into", "that", "this", "your", "via", "workflow"}
+
+
+def tokenize(text):
+    """Lowercase keyword tokens used by the catalog's keyword index"""
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if len(t) > 2 and t not in STOPWORDS]
+
+
+def catalog_path():
+    """Configured catalog location, without loading the catalog"""
+    return os.getenv("AUTOMATION_CATALOG", DEFAULT_CATALOG_PATH)
+
+
+def slugify(name):
+    return "_".join(re.findall(r"[a-z0-9]+", name.lower())) or "workflow"
+
+
+def extract_automations(workflow):
+    """Turn one n8n workflow into registry entries, one per webhook trigger"""
+    nodes = workflow.get("nodes", [])
+    webhooks = [n for n in nodes if n.get("type") == WEBHOOK_NODE and n.get("parameters", {}).get("path")]
+    if not webhooks:
+        return {}
+
+    description = workflow.get("description") or ""
+    if not description:
+        notes = [n["parameters"].get("content", "") for n in nodes
+                 if n.get("type") == STICKY_NOTE_NODE and n.get("parameters", {}).get("content")]
+        description = notes[0].strip().splitlines()[0].lstrip("# ").strip() if notes else workflow.get("name", "")
+
+    base = slugify(workflow.get("name", ""))
+    entries = {}
+    for i, node in enumerate(webhooks):
+        name = base if len(webhooks) == 1 else f"{base}_{i + 1}"
+        entries[name] = {
+            "description": description,
+            "webhook_path": "/webhook/" + node["parameters"]["path"].lstrip("/"),
+            "workflow_id": workflow.get("id"),
+            "active": bool(workflow.get("active")),
+        }
+    return entries
+
+
+class AutomationCatalog:
+    """Synced automations plus name / webhook path / keyword indexes, stored as one JSON file"""
+    def __init__(self, path=None):
+        self.path = path or catalog_path()
+        self.workflows = {}
+        self.automations = {}
+        self.by_webhook = {}
+        self.by_keyword = {}
+        self.synced_at = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        self.workflows = data.get("workflows", {})
+        self.automations = data.get("automations", {})
+        self.by_webhook = data.get("index", {}).get("webhook_path", {})
+        self.by_keyword = data.get("index", {}).get("keyword", {})
+        self.synced_at = data.get("synced_at")
+        return True
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {
+            "synced_at": self.synced_at,
+            "workflows": self.workflows,
+            "automations": self.automations,
+            "index": {"webhook_path": self.by_webhook, "keyword": self.by_keyword}
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def sync(self, workflows):
+        """Refresh from an iterable of n8n workflows.
+
+        Workflows whose `updatedAt` has not changed keep their stored entries;
+        workflows that no longer exist are dropped. Returns change counts.
+        """
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+        previous = self.workflows
+        current = {}
+
+        for workflow in workflows:
+            workflow_id = str(workflow.get("id"))
+            old = previous.get(workflow_id)
+            if old and old.get("updatedAt") == workflow.get("updatedAt"):
+                current[workflow_id] = old
+                stats["unchanged"] += 1
+                continue
+
+            current[workflow_id] = {
+                "name": workflow.get("name"),
+                "updatedAt": workflow.get("updatedAt"),
+                "automations": extract_automations(workflow)
+            }
+            stats["updated" if old else "added"] += 1
+
+        stats["removed"] = len(set(previous) - set(current))
+        self.workflows = current
+        self.synced_at = datetime.now().isoformat()
+        self.rebuild_index()
+        return stats
+
+    def rebuild_index(self):
+        self.automations = {}
+        self.by_webhook = {}
+        self.by_keyword = {}
+
+        for workflow_id in sorted(self.workflows):
+            for name, entry in self.workflows[workflow_id]["automations"].items():
+                if name in self.automations:
+                    name = f"{name}_{workflow_id}"
+                self.automations[name] = entry
+                self.by_webhook.setdefault(entry["webhook_path"], name)
+                for token in set(tokenize(f"{name} {entry['description']}")):
+                    self.by_keyword.setdefault(token, []).append(name)
+
+    def get(self, name):
+        return self.automations.get(name)
+
+    def find_by_webhook(self, webhook_path):
+        name = self.by_webhook.get(webhook_path)
+        return (name, self.automations[name]) if name else (None, None)
+
+    def find_by_keyword(self, keyword):
+        return list(self.by_keyword.get(keyword.lower(), []))
+
+    def active_automations(self):
+        return {name: entry for name, entry in self.automations.items() if entry.get("active")}
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Persistent cross-run index of contacted leads.
+
+Membership is answered by a memory-mapped Bloom filter; a "maybe" is confirmed
+against an exact SQLite set of 64-bit key hashes, so false positives never
+suppress a new lead. Memory stays bounded by the filter size, not the index size.
+"""
+import os
+import re
+import math
+import mmap
+import struct
+import sqlite3
+import hashlib
+
+DEFAULT_INDEX_PATH = "data/contacted_leads"
+DEFAULT_CAPACITY = 10_000_000
+DEFAULT_ERROR_RATE = 0.01
+
+HEADER = struct.Struct("<4sIQ")  # magic, hash count, bit count
+MAGIC = b"ZBLM"
+MASK64 = (1 << 64) - 1
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+HANDLE_FIELDS = ("handle", "username", "author", "user")
+# Providers where "name+tag@" is delivered to "name@"; elsewhere a +tag may be a different mailbox
+PLUS_ADDRESS_DOMAINS = {
+    "gmail.com", "googlemail.com", "outlook.com", "hotmail.com",
+    "icloud.com", "fastmail.com", "proton.me", "protonmail.com",
+}
+
+
+def normalize_lead(lead):
+    """Return a stable dedup key for a lead (email or handle), or None"""
+    if isinstance(lead, dict):
+        email = lead.get("email")
+        if email:
+            return normalize_lead(str(email))
+        for field in HANDLE_FIELDS:
+            if lead.get(field):
+                return normalize_handle(str(lead[field]))
+        return None
+    if not isinstance(lead, str) or not lead.strip():
+        return None
+
+    value = lead.strip().lower()
+    if EMAIL_RE.match(value):
+        local, domain = value.split("@", 1)
+        if domain in PLUS_ADDRESS_DOMAINS:
+            local = local.split("+", 1)[0]
+        return f"email:{local}@{domain}"
+    return normalize_handle(value)
+
+
+def normalize_handle(handle):
+    value = handle.strip().lower()
+    value = re.sub(r"^(/?u/|@)", "", value)
+    return f"handle:{value}" if value else None
+
+
+def _hash64(key):
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+
+
+def _mix64(h):
+    """splitmix64 finalizer, used as the second hash for double hashing"""
+    h = (h + 0x9E3779B97F4A7C15) & MASK64
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & MASK64
+    return h ^ (h >> 31)
+
+
+def _to_signed(h):
+    return h - (1 << 64) if h >= (1 << 63) else h
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter backed by a memory-mapped file"""
+    def __init__(self, path, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE):
+        self.path = path
+        self.created = not os.path.exists(path)
+
+        if self.created:
+            num_bits = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+            num_bits = (num_bits + 7) // 8 * 8
+            num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+            with open(path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, num_hashes, num_bits))
+                f.truncate(HEADER.size + num_bits // 8)
+
+        self.file = open(path, "r+b")
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        magic, self.num_hashes, self.num_bits = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a dedup Bloom filter: {path}")
+
+    def _positions(self, h):
+        h2 = _mix64(h) | 1
+        return ((h + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, h):
+        for pos in self._positions(h):
+            self.map[HEADER.size + (pos >> 3)] |= 1 << (pos & 7)
+
+    def might_contain(self, h):
+        return all(self.map[HEADER.size + (pos >> 3)] & (1 << (pos & 7)) for pos in self._positions(h))
+
+    def close(self):
+        self.map.flush()
+        self.map.close()
+        self.file.close()
+
+
+class LeadDedupIndex:
+    """Persistent set of contacted leads, keyed by normalized email or handle"""
+    def __init__(self, path=None, capacity=None):
+        path = path or os.getenv("DEDUP_INDEX_PATH", DEFAULT_INDEX_PATH)
+        capacity = capacity or int(os.getenv("DEDUP_CAPACITY", DEFAULT_CAPACITY))
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.db = sqlite3.connect(f"{path}.db")
+        self.db.execute("CREATE TABLE IF NOT EXISTS contacted (key_hash INTEGER PRIMARY KEY) WITHOUT ROWID")
+        self.bloom = BloomFilter(f"{path}.bloom", capacity=capacity)
+
+        if self.bloom.created:
+            self._rebuild_bloom()
+
+    def _rebuild_bloom(self):
+        """Repopulate a fresh filter from the exact set (e.g. after deleting the .bloom file)"""
+        for (h,) in self.db.execute("SELECT key_hash FROM contacted"):
+            self.bloom.add(h & MASK64)
+
+    def _exact_contains(self, h):
+        row = self.db.execute("SELECT 1 FROM contacted WHERE key_hash = ?", (_to_signed(h),)).fetchone()
+        return row is not None
+
+    def contains(self, lead):
+        key = normalize_lead(lead)
+        if key is None:
+            return False
+        h = _hash64(key)
+        return self.bloom.might_contain(h) and self._exact_contains(h)
+
+    def add_many(self, leads):
+        """Record leads as contacted; returns how many were new"""
+        hashes = {_hash64(key) for key in map(normalize_lead, leads) if key}
+        before = self.db.total_changes
+        with self.db:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO contacted (key_hash) VALUES (?)",
+                ((_to_signed(h),) for h in hashes)
+            )
+        for h in hashes:
+            self.bloom.add(h)
+        return self.db.total_changes - before
+
+    def filter_new(self, leads):
+        """Split leads into (new, suppressed_count), also dropping repeats within the batch"""
+        fresh = []
+        seen = set()
+        suppressed = 0
+        for lead in leads:
+            key = normalize_lead(lead)
+            if key is None:
+                fresh.append(lead)
+                continue
+            h = _hash64(key)
+            if h in seen or (self.bloom.might_contain(h) and self._exact_contains(h)):
+                suppressed += 1
+                continue
+            seen.add(h)
+            fresh.append(lead)
+        return fresh, suppressed
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM contacted").fetchone()[0]
+
+    def close(self):
+        self.bloom.close()
+        self.db.close()
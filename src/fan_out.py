@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Chunked fan-out for automations that take large list parameters"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_RATE_LIMIT = 5      # chunk requests per second
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_RETRY_BACKOFF = 1.0  # seconds before the first retry pass, doubled after each
+
+
+class RateLimiter:
+    """Space out calls so no more than `rate` start per second (thread-safe)"""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class FanOut:
+    """Split one list parameter into chunks and send each chunk as its own request"""
+    def __init__(self, config):
+        self.param = config.get("param", "emails")
+        self.chunk_size = max(1, int(config.get("chunk_size", DEFAULT_CHUNK_SIZE)))
+        self.max_workers = max(1, int(config.get("max_workers", DEFAULT_MAX_WORKERS)))
+        self.max_retries = max(0, int(config.get("max_retries", DEFAULT_MAX_RETRIES)))
+        self.retry_backoff = max(0.0, float(config.get("retry_backoff", DEFAULT_RETRY_BACKOFF)))
+        self.rate_limiter = RateLimiter(config.get("rate_limit", DEFAULT_RATE_LIMIT))
+
+    def applies_to(self, params):
+        """Only fan out when the list is larger than a single chunk"""
+        values = (params or {}).get(self.param)
+        return isinstance(values, list) and len(values) > self.chunk_size
+
+    def split(self, values):
+        return [values[i:i + self.chunk_size] for i in range(0, len(values), self.chunk_size)]
+
+    def run(self, params, send_chunk):
+        """Send every chunk through `send_chunk(chunk_params, index, total)`.
+
+        Chunks run concurrently on a bounded pool; after each pass only the
+        chunks that failed with a transport error (marked "retryable": timeouts,
+        connection errors, 5xx) are retried, after a delay of `retry_backoff`
+        seconds that doubles with each pass. A chunk the webhook accepted is
+        never resent. Returns the per-chunk results in order.
+        """
+        values = params[self.param]
+        chunks = self.split(values)
+        total = len(chunks)
+        # Large lists never travel whole: one aligned with the fan-out list
+        # (same length) is sliced with it, any other longer than a chunk is
+        # dropped. Short lists and scalars are sent with every chunk.
+        aligned, shared = {}, {}
+        for key, value in params.items():
+            if key == self.param:
+                continue
+            if isinstance(value, list) and len(value) == len(values):
+                aligned[key] = value
+            elif not isinstance(value, list) or len(value) <= self.chunk_size:
+                shared[key] = value
+        results = [None] * total
+        attempts = [0] * total
+        pending = list(range(total))
+
+        def send(index):
+            self.rate_limiter.wait()
+            start = index * self.chunk_size
+            chunk_params = dict(shared)
+            chunk_params[self.param] = chunks[index]
+            for key, value in aligned.items():
+                chunk_params[key] = value[start:start + self.chunk_size]
+            try:
+                return send_chunk(chunk_params, index, total)
+            except Exception as e:
+                return {"status": "error", "message": str(e)}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, total)) as pool:
+            for attempt in range(self.max_retries + 1):
+                if not pending:
+                    break
+                if attempt:
+                    time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+                for index, result in zip(pending, pool.map(send, pending)):
+                    attempts[index] += 1
+                    results[index] = result
+                pending = [i for i in pending
+                           if results[i].get("status") == "error" and results[i].get("retryable")]
+
+        return [
+            {"chunk": i, "size": len(chunks[i]), "attempts": attempts[i], "result": results[i]}
+            for i in range(total)
+        ]
+
+
+def merge_chunk_data(chunk_results):
+    """Merge successful chunk responses: lists are concatenated, numbers summed,
+    anything else keeps the last value seen"""
+    merged = {}
+    for chunk in chunk_results:
+        data = chunk["result"].get("data")
+        if chunk["result"].get("status") == "error" or not isinstance(data, dict):
+            continue
+        for key, value in data.items():
+            current = merged.get(key)
+            if isinstance(value, list) and isinstance(current, list):
+                merged[key] = current + value
+            elif (isinstance(value, (int, float)) and not isinstance(value, bool)
+                  and isinstance(current, (int, float)) and not isinstance(current, bool)):
+                merged[key] = current + value
+            else:
+                merged[key] = value
+    return merged
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Bounded conversation history backed by a local SQLite store.
+
+Only compact summaries stay in memory (a fixed-size ring); full webhook
+results are written to SQLite and loaded on demand.
+"""
+import os
+import json
+import sqlite3
+import threading
+from collections import deque
+
+DEFAULT_HISTORY_PATH = "data/history.db"
+DEFAULT_RING_SIZE = 100
+DEFAULT_PAGE_SIZE = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    type TEXT NOT NULL,
+    automation TEXT,
+    status TEXT,
+    input TEXT,
+    result TEXT,
+    analysis TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_automation ON history (automation, timestamp);
+CREATE INDEX IF NOT EXISTS idx_history_status ON history (status, timestamp);
+CREATE INDEX IF NOT EXISTS idx_history_timestamp ON history (timestamp);
+"""
+
+SUMMARY_COLUMNS = "id, timestamp, type, automation, status, input, analysis"
+
+
+def entry_status(entry):
+    """Overall status of a history entry; multi-step entries roll up their steps"""
+    if entry.get("type") != "multi_step":
+        return entry.get("status") or entry.get("result", {}).get("status", "unknown")
+    steps = entry.get("steps", [])
+    if any(s.get("failed") for s in steps):
+        return "error"
+    if any(s.get("skipped") for s in steps):
+        return "partial"
+    return "success"
+
+
+def entry_automation(entry):
+    if entry.get("type") == "multi_step":
+        return ",".join(s.get("automation", "") for s in entry.get("steps", []))
+    return entry.get("automation")
+
+
+class HistoryStore:
+    """History as a ring of recent summaries plus an indexed on-disk store"""
+    def __init__(self, path=None, ring_size=None):
+        self.path = path or os.getenv("HISTORY_PATH", DEFAULT_HISTORY_PATH)
+        ring_size = ring_size or int(os.getenv("HISTORY_RING_SIZE", DEFAULT_RING_SIZE))
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        self.recent = deque(maxlen=ring_size)
+
+    def add(self, entry):
+        """Persist a full entry and keep its compact summary in memory"""
+        full = {k: v for k, v in entry.items() if k not in ("input", "timestamp", "type")}
+        summary = {
+            "timestamp": entry["timestamp"],
+            "type": entry.get("type", "single"),
+            "automation": entry_automation(entry),
+            "status": entry_status(entry),
+            "input": entry.get("input"),
+            "analysis": None,
+        }
+        with self.lock:
+            with self.db:
+                cursor = self.db.execute(
+                    "INSERT INTO history (timestamp, type, automation, status, input, result) VALUES (?, ?, ?, ?, ?, ?)",
+                    (summary["timestamp"], summary["type"], summary["automation"], summary["status"],
+                     summary["input"], json.dumps(full, default=str))
+                )
+            summary["id"] = cursor.lastrowid
+            self.recent.append(summary)
+        return summary
+
+    def set_analysis(self, entry_id, analysis):
+        """Attach an analysis; called from the background analysis pool"""
+        with self.lock:
+            with self.db:
+                self.db.execute("UPDATE history SET analysis = ? WHERE id = ?", (analysis, entry_id))
+            for summary in self.recent:
+                if summary["id"] == entry_id:
+                    summary["analysis"] = analysis
+
+    def get(self, entry_id):
+        """Full entry including the stored webhook result, or None"""
+        with self.lock:
+            row = self.db.execute("SELECT * FROM history WHERE id = ?", (entry_id,)).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry.update(json.loads(entry.pop("result") or "{}"))
+        return entry
+
+    def search(self, automation=None, status=None, since=None, until=None, page=1, page_size=DEFAULT_PAGE_SIZE):
+        """Page through stored summaries, newest first.
+
+        `automation` also matches steps of multi-step entries; `since`/`until`
+        are ISO timestamps (inclusive / exclusive).
+        """
+        clauses, args = [], []
+        if automation:
+            clauses.append("(automation = ? OR ',' || automation || ',' LIKE ?)")
+            args += [automation, f"%,{automation},%"]
+        if status:
+            clauses.append("status = ?")
+            args.append(status)
+        if since:
+            clauses.append("timestamp >= ?")
+            args.append(since)
+        if until:
+            clauses.append("timestamp < ?")
+            args.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        args += [page_size, (max(page, 1) - 1) * page_size]
+        with self.lock:
+            rows = self.db.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM history {where} ORDER BY id DESC LIMIT ? OFFSET ?", args
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def clear(self):
+        """Forget this session's recent entries; the on-disk store is kept"""
+        with self.lock:
+            self.recent.clear()
+
+    # The ring is shared with the analysis pool, so reads take a copy under the lock
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self.recent))
+
+    def __len__(self):
+        return len(self.recent)
+
+    def __getitem__(self, index):
+        with self.lock:
+            return list(self.recent)[index]
@@ -11,12 +11,21 @@ def print_banner():
     print("="*60)
     print("Commands:")
     print("  - Type your request naturally")
-    print("  - 'history' - Show conversation history")
+    print("  - 'history [page]' - Show conversation history (newest first)")
+    print("  - 'search automation=<name> status=<status> since=<date> until=<date>' - Search history")
+    print("  - 'summary <n>' - Show the summary of history entry n")
     print("  - 'list' or 'show automations' - List available automations")
     print("  - 'clear' - Clear history")
     print("  - 'exit' or 'quit' - Exit")
     print("="*60 + "\n")
 
+def print_history_entries(entries):
+    for item in entries:
+        print(f"\n#{item['id']}. {item['timestamp']}")
+        print(f"   Input: {item['input']}")
+        print(f"   Automation: {item['automation'] or '-'}")
+        print(f"   Status: {item['status'] or 'unknown'}")
+
 def main():
     # Load environment
     if os.path.exists(".env"):
@@ -26,7 +35,7 @@ def main():
                     key, value = line.strip().split("=", 1)
                     os.environ[key] = value
     
-    agent = MasterAgent()
+    agent = MasterAgent(profile="--profile" in sys.argv[1:])
     print_banner()
     
     while True:
@@ -46,18 +55,47 @@ def main():
                 
                 break
             
-            if user_input.lower() == 'history':
-                if agent.history:
-                    print("\n📜 Conversation History:")
-                    for i, item in enumerate(agent.history, 1):
-                        print(f"\n{i}. {item['timestamp']}")
-                        print(f"   Input: {item['input']}")
-                        print(f"   Automation: {item['automation']}")
-                        print(f"   Status: {item['result'].get('status', 'unknown')}")
+            if user_input.lower().split()[0] == 'history':
+                parts = user_input.split()
+                page = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 1
+                entries = agent.history.search(page=page)
+                if entries:
+                    print(f"\n📜 Conversation History (page {page}, {agent.history.count()} total):")
+                    print_history_entries(entries)
                 else:
                     print("\n📜 No history yet")
                 continue
             
+            if user_input.lower().startswith('search '):
+                filters = dict(part.split("=", 1) for part in user_input.split()[1:] if "=" in part)
+                unknown = set(filters) - {"automation", "status", "since", "until", "page"}
+                if unknown:
+                    print(f"\n❌ Unknown filter(s): {', '.join(sorted(unknown))}")
+                    continue
+                if "page" in filters:
+                    filters["page"] = int(filters["page"]) if filters["page"].isdigit() else 1
+                entries = agent.history.search(**filters)
+                if entries:
+                    print("\n🔍 Matching History:")
+                    print_history_entries(entries)
+                else:
+                    print("\n🔍 No matching history")
+                continue
+            
+            if user_input.lower().startswith('summary '):
+                entry_id = user_input.split(maxsplit=1)[1].strip().lstrip('#')
+                if not entry_id.isdigit():
+                    print("\n❌ Usage: summary <n>")
+                    continue
+                analysis = agent.get_analysis(int(entry_id))
+                if analysis is None and int(entry_id) in agent.pending_analyses:
+                    print(f"\n⏳ Summary #{entry_id} is still being prepared")
+                elif analysis is None:
+                    print(f"\n📜 No summary for #{entry_id}")
+                else:
+                    print(f"\n📝 Summary #{entry_id}:\n{analysis}")
+                continue
+            
             if user_input.lower() == 'list':
                 print("\n📋 Available Automations:")
                 for name, data in agent.automations.items():
@@ -65,10 +103,10 @@ def main():
                 continue
             
             if user_input.lower() == 'clear':
-                agent.history = []
+                agent.history.clear()
                 from analytics import Analytics
                 agent.analytics = Analytics()
-                print("\n🗑️  History and analytics cleared")
+                print("\n🗑️  Session history and analytics cleared (stored history is kept)")
                 continue
             
             # Process request
@@ -76,6 +114,7 @@ def main():
             result = agent.run(user_input)
             print(result)
             print()
+            agent.profiler.report()
             
         except KeyboardInterrupt:
             print("\n\n👋 Goodbye!")
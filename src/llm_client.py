@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Single LLM client layer: provider setup, per-call-site model tiers, token accounting"""
+import os
+import time
+from llm_limiter import LLMRateLimiter
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_RETRIES = 2
+
+# Fast tier for routing and extraction, smart tier for user-facing analysis
+CALL_SITE_TIERS = {
+    "extract_parameters": "fast",
+    "find_automation": "fast",
+    "detect_multi_step": "fast",
+    "suggest_automations": "fast",
+    "analyze_result": "smart",
+}
+
+DEFAULT_MODELS = {
+    "openai": {"fast": "gpt-4o-mini", "smart": "gpt-4o"},
+    "anthropic": {"fast": "claude-3-5-haiku-20241022", "smart": "claude-3-5-sonnet-20241022"},
+}
+
+
+class LLMClient:
+    """Owns the provider SDK client (timeouts, retries, pooled connections) and
+    routes each call site to its model.
+
+    Models resolve in this order: LLM_MODEL_<CALL_SITE>, <PROVIDER>_<TIER>_MODEL,
+    <PROVIDER>_MODEL, then the built-in tier default.
+    """
+    def __init__(self, provider=None, on_call=None):
+        self.provider = (provider or os.getenv("LLM_PROVIDER", "openai")).lower()
+        self.on_call = on_call
+        timeout = float(os.getenv("LLM_TIMEOUT", DEFAULT_TIMEOUT))
+        max_retries = int(os.getenv("LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+
+        if self.provider == "openai":
+            from openai import OpenAI
+            self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=timeout, max_retries=max_retries)
+        else:
+            self.provider = "anthropic"
+            from anthropic import Anthropic
+            self.client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), timeout=timeout, max_retries=max_retries)
+
+        self.limiter = LLMRateLimiter(self.provider)
+        self.models = {call_site: self._resolve_model(call_site, tier)
+                       for call_site, tier in CALL_SITE_TIERS.items()}
+
+    def _resolve_model(self, call_site, tier):
+        prefix = self.provider.upper()
+        return (os.getenv(f"LLM_MODEL_{call_site.upper()}")
+                or os.getenv(f"{prefix}_{tier.upper()}_MODEL")
+                or os.getenv(f"{prefix}_MODEL")
+                or DEFAULT_MODELS[self.provider][tier])
+
+    def model_for(self, call_site):
+        return self.models.get(call_site) or self._resolve_model(call_site, "fast")
+
+    def complete(self, call_site, prompt, max_tokens):
+        """Send a single-turn prompt and return the response text.
+
+        Waits for the shared rate limiter first; raises LLMBudgetExceeded when
+        the daily token budget is used up.
+        """
+        model = self.model_for(call_site)
+        messages = [{"role": "user", "content": prompt}]
+        estimated_tokens = self.limiter.estimate_tokens(prompt, max_tokens)
+        queue_wait = self.limiter.acquire(estimated_tokens)
+        started = time.perf_counter()
+        prompt_tokens = completion_tokens = 0
+
+        try:
+            if self.provider == "openai":
+                response = self.client.chat.completions.create(model=model, max_tokens=max_tokens, messages=messages)
+                text = response.choices[0].message.content or ""
+                usage = response.usage
+                prompt_tokens = getattr(usage, "prompt_tokens", 0) if usage else 0
+                completion_tokens = getattr(usage, "completion_tokens", 0) if usage else 0
+            else:
+                response = self.client.messages.create(model=model, max_tokens=max_tokens, messages=messages)
+                text = response.content[0].text
+                usage = response.usage
+                prompt_tokens = getattr(usage, "input_tokens", 0) if usage else 0
+                completion_tokens = getattr(usage, "output_tokens", 0) if usage else 0
+        finally:
+            self.limiter.settle(estimated_tokens, prompt_tokens + completion_tokens)
+
+        if self.on_call:
+            self.on_call(call_site, model, prompt_tokens, completion_tokens, time.perf_counter() - started, queue_wait)
+        return text
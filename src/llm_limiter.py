@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Token-bucket limits for LLM calls, shared by every local process using the same provider.
+
+State lives in a small JSON file guarded by an exclusive file lock. Each caller
+reserves its slot under the lock (GCRA-style "theoretical arrival time"), then
+sleeps outside it, so callers are served in arrival order and a crashed
+process never blocks the queue.
+"""
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import date
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: limits are only enforced within this process
+    fcntl = None
+
+DEFAULT_STATE_DIR = "data"
+CHARS_PER_TOKEN = 4
+
+
+class LLMBudgetExceeded(Exception):
+    """Raised when a call would go over the daily token budget"""
+
+
+class LLMRateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets plus an optional daily token budget"""
+    def __init__(self, provider, rpm=None, tpm=None, daily_budget=None, state_dir=None):
+        self.rpm = rpm if rpm is not None else int(os.getenv("LLM_RPM", 0))
+        self.tpm = tpm if tpm is not None else int(os.getenv("LLM_TPM", 0))
+        self.daily_budget = daily_budget if daily_budget is not None else int(os.getenv("LLM_DAILY_TOKEN_BUDGET", 0))
+        state_dir = state_dir or os.getenv("LLM_LIMIT_STATE_DIR", DEFAULT_STATE_DIR)
+        self.path = os.path.join(state_dir, f"llm_limits_{provider}.json")
+        self.thread_lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.rpm or self.tpm or self.daily_budget)
+
+    @contextmanager
+    def _locked_state(self):
+        with self.thread_lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a+") as f:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read() or "{}")
+                    except json.JSONDecodeError:
+                        state = {}
+                    yield state
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    if fcntl:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _reserve(state, key, per_minute, cost, now):
+        """Reserve `cost` units from a bucket of `per_minute` capacity; returns seconds to wait"""
+        if not per_minute:
+            return 0
+        interval = 60.0 / per_minute
+        tat = max(state.get(key, 0), now)
+        state[key] = tat + cost * interval
+        return max(0.0, state[key] - 60.0 - now)
+
+    def estimate_tokens(self, prompt, max_tokens):
+        return len(prompt) // CHARS_PER_TOKEN + max_tokens
+
+    def acquire(self, estimated_tokens):
+        """Wait for a slot; returns the seconds spent queued"""
+        if not self.enabled:
+            return 0
+        with self._locked_state() as state:
+            today = date.today().isoformat()
+            if state.get("day") != today:
+                state["day"], state["used"] = today, 0
+            if self.daily_budget and state["used"] + estimated_tokens > self.daily_budget:
+                raise LLMBudgetExceeded(
+                    f"Daily LLM token budget reached ({state['used']}/{self.daily_budget} tokens used)"
+                )
+            state["used"] += estimated_tokens
+
+            now = time.time()
+            wait = max(self._reserve(state, "rpm_tat", self.rpm, 1, now),
+                       self._reserve(state, "tpm_tat", self.tpm, estimated_tokens, now))
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def settle(self, estimated_tokens, actual_tokens):
+        """Correct the token bucket and budget once the real usage is known"""
+        if not self.enabled or actual_tokens == estimated_tokens:
+            return
+        difference = actual_tokens - estimated_tokens
+        with self._locked_state() as state:
+            if state.get("day") == date.today().isoformat():
+                state["used"] = max(0, state.get("used", 0) + difference)
+            if self.tpm and "tpm_tat" in state:
+                state["tpm_tat"] += difference * 60.0 / self.tpm
@@ -3,66 +3,86 @@ import os
 import json
 import requests
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from styling import *
 from analytics import Analytics
+from fan_out import FanOut, merge_chunk_data
+from dedup import LeadDedupIndex
+from catalog import AutomationCatalog, catalog_path
+from registry import AutomationRegistry
+from routing import shortlist
+from llm_client import LLMClient
+from llm_limiter import LLMBudgetExceeded
+from plan_cache import PlanCache
+from history import HistoryStore
+from profiler import PhaseProfiler
 
 class MasterAgent:
-    def __init__(self):
-        self.llm_provider = os.getenv("LLM_PROVIDER", "openai").lower()
+    def __init__(self, profile=False):
         self.n8n_base_url = os.getenv("N8N_BASE_URL", "http://localhost:5678")
         
-        if self.llm_provider == "openai":
-            from openai import OpenAI
-            self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        else:
-            from anthropic import Anthropic
-            self.client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-            self.model = "claude-3-5-sonnet-20241022"
-        
-        self.automations = self.load_automations()
-        self.history = []
+        self.history = HistoryStore()
         self.analytics = Analytics()
+        self.defer_analysis = os.getenv("DEFER_ANALYSIS", "").lower() in ("1", "true", "yes")
+        self.analysis_pool = None
+        self.pending_analyses = {}
+        self.llm = LLMClient(on_call=lambda *call: self.analytics.track_llm_call(*call))
+        self.dedup_index = None
+        self.plan_cache = PlanCache()
+        self.profiler = PhaseProfiler(enabled=profile)
+        self._local = threading.local()
+        self.registry = AutomationRegistry(
+            self.load_automations,
+            ["config/automations.json", catalog_path()],
+            on_reload=lambda seconds, count: self.analytics.track_reload(seconds, count)
+        )
+    
+    @property
+    def automations(self):
+        """Automations of the snapshot pinned by the running request, else the latest"""
+        return self.snapshot().automations
+    
+    def snapshot(self):
+        return getattr(self._local, "snapshot", None) or self.registry.snapshot
+    
+    def candidate_automations(self, user_input):
+        """Top-K automations for this input from the local routing index"""
+        snapshot = self.snapshot()
+        return shortlist(snapshot.automations, snapshot.routing_index, user_input)
     
     def load_automations(self):
-        """Load automation registry from JSON file"""
+        """Load automation registry: synced n8n catalog plus hand-written entries.
+
+        Entries in config/automations.json win over catalog entries with the same
+        name or webhook path, so their validation and fan-out settings are kept.
+        """
         try:
             with open("config/automations.json", "r") as f:
-                return json.load(f)
+                manual = json.load(f)
         except FileNotFoundError:
-            return {}
+            manual = {}
+
+        catalog = AutomationCatalog()
+        manual_paths = {data.get("webhook_path") for data in manual.values()}
+        automations = {}
+        for name, data in catalog.active_automations().items():
+            if name not in manual and data["webhook_path"] not in manual_paths:
+                automations[name] = data
+        automations.update(manual)
+        return automations
     
-    def validate_response(self, automation_name, response_data):
-        """Validate webhook response against expected schema"""
-        automation = self.automations.get(automation_name, {})
-        expected = automation.get("expected_response", {})
-        
-        if not expected:
+    def validate_response(self, automation_name, response_data, snapshot=None):
+        """Validate webhook response against expected schema.
+
+        Worker threads do not see the request's pinned snapshot, so callers
+        off the main thread must pass it in.
+        """
+        validator = (snapshot or self.snapshot()).validators.get(automation_name)
+        if not validator:
             return True, None
-        
-        required_fields = expected.get("required_fields", [])
-        
-        # Check required fields
-        for field in required_fields:
-            if field not in response_data:
-                return False, f"Missing required field: {field}"
-        
-        # Type validation
-        for field, expected_type in expected.items():
-            if field == "required_fields":
-                continue
-            
-            if field in response_data:
-                value = response_data[field]
-                if expected_type == "array" and not isinstance(value, list):
-                    return False, f"Field '{field}' should be array, got {type(value).__name__}"
-                elif expected_type == "number" and not isinstance(value, (int, float)):
-                    return False, f"Field '{field}' should be number, got {type(value).__name__}"
-                elif expected_type == "string" and not isinstance(value, str):
-                    return False, f"Field '{field}' should be string, got {type(value).__name__}"
-        
-        return True, None
+        return validator(response_data)
     
     def evaluate_condition(self, condition, previous_result):
         """Evaluate step condition based on previous result"""
@@ -97,20 +117,7 @@ Extract:
 
 Return ONLY valid JSON, no explanation."""
 
-        if self.llm_provider == "openai":
-            response = self.client.chat.completions.create(
-                model=self.model,
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            result = response.choices[0].message.content.strip()
-        else:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            result = response.content[0].text.strip()
+        result = self.llm.complete("extract_parameters", prompt, max_tokens=300).strip()
         
         try:
             return json.loads(result)
@@ -120,7 +127,7 @@ Return ONLY valid JSON, no explanation."""
     def find_automation(self, user_input):
         """Use LLM to match user input to automation with confidence score"""
         automation_list = "\n".join([f"- {name}: {data['description']}" 
-                                     for name, data in self.automations.items()])
+                                     for name, data in self.candidate_automations(user_input).items()])
         
         prompt = f"""Available automations:
 {automation_list}
@@ -130,20 +137,7 @@ User request: {user_input}
 Which automation best matches? Reply with ONLY the automation name from the list above.
 If no good match, reply with "NONE"."""
 
-        if self.llm_provider == "openai":
-            response = self.client.chat.completions.create(
-                model=self.model,
-                max_tokens=50,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            match = response.choices[0].message.content.strip()
-        else:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=50,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            match = response.content[0].text.strip()
+        match = self.llm.complete("find_automation", prompt, max_tokens=50).strip()
         
         # Return match data if found
         if match in self.automations:
@@ -152,16 +146,153 @@ If no good match, reply with "NONE"."""
     
     def execute_automation(self, automation_name, user_input, params=None):
         """Trigger n8n webhook with enhanced payload"""
-        automation = self.automations[automation_name]
+        snapshot = self.snapshot()
+        automation = snapshot.automations[automation_name]
         webhook_path = automation["webhook_path"]
         webhook_url = f"{self.n8n_base_url}{webhook_path}"
         
-        payload = {
-            "user_input": user_input,
-            "timestamp": datetime.now().isoformat(),
-            "parameters": params or {}
+        fan_out_config = automation.get("fan_out")
+        if fan_out_config and FanOut(fan_out_config).applies_to(params):
+            result = self.execute_fan_out(automation_name, webhook_url, user_input, params,
+                                          FanOut(fan_out_config), snapshot)
+        else:
+            payload = {
+                "user_input": user_input,
+                "timestamp": datetime.now().isoformat(),
+                "parameters": params or {}
+            }
+            result = self._post_webhook(automation_name, webhook_url, payload, snapshot)
+        
+        self.record_contacted(automation_name, params, result)
+        return self.filter_contacted(automation_name, result)
+    
+    def execute_fan_out(self, automation_name, webhook_url, user_input, params, fan_out, snapshot):
+        """Send a large list parameter in concurrent chunks and merge the responses.
+
+        Chunks are sent from pool threads, so each one validates against the
+        `snapshot` captured by the request rather than the thread's own.
+        """
+        def send_chunk(chunk_params, index, total):
+            payload = {
+                "user_input": user_input,
+                "timestamp": datetime.now().isoformat(),
+                "parameters": chunk_params,
+                "chunk": {"index": index, "total": total}
+            }
+            return self._post_webhook(automation_name, webhook_url, payload, snapshot)
+        
+        chunk_results = fan_out.run(params, send_chunk)
+        total = len(chunk_results)
+        failed = [c for c in chunk_results if c["result"].get("status") == "error"]
+        chunks = {
+            "total": total,
+            "succeeded": total - len(failed),
+            "failed": len(failed),
+            "failed_chunks": [
+                {"chunk": c["chunk"], "size": c["size"], "attempts": c["attempts"],
+                 "message": c["result"].get("message", "Unknown error"),
+                 "delivered": bool(c["result"].get("delivered"))}
+                for c in failed
+            ]
         }
         
+        if len(failed) == total:
+            return {
+                "status": "error",
+                "message": f"All {total} chunks failed: {failed[-1]['result'].get('message', 'Unknown error')}",
+                "chunks": chunks
+            }
+        
+        result = {"status": "partial" if failed else "success", "chunks": chunks}
+        data = merge_chunk_data(chunk_results)
+        if data:
+            is_valid, error_msg = self.validate_response(automation_name, data, snapshot)
+            if not is_valid:
+                return {
+                    "status": "error",
+                    "message": f"Response validation failed: {error_msg}",
+                    "data": data,
+                    "chunks": chunks,
+                    "delivered": True
+                }
+            result["data"] = data
+        if failed:
+            result["message"] = f"{len(failed)} of {total} chunks failed"
+        return result
+    
+    def get_dedup_index(self):
+        """Open the contacted-leads index on first use"""
+        if self.dedup_index is None:
+            self.dedup_index = LeadDedupIndex()
+        return self.dedup_index
+    
+    def filter_contacted(self, automation_name, result):
+        """Drop leads that were already contacted in a previous run"""
+        dedup = self.automations[automation_name].get("dedup")
+        data = result.get("data")
+        if not dedup or result.get("status") == "error" or not isinstance(data, dict):
+            return result
+        
+        field = dedup.get("field", "leads")
+        if not isinstance(data.get(field), list):
+            return result
+        
+        fresh, suppressed = self.get_dedup_index().filter_new(data[field])
+        data[field] = fresh
+        if isinstance(data.get("count"), (int, float)):
+            data["count"] = len(fresh)
+        data["duplicates_suppressed"] = suppressed
+        self.analytics.track_duplicates(suppressed)
+        return result
+    
+    def record_contacted(self, automation_name, params, result):
+        """Add the recipients of a delivered outreach to the dedup index.
+
+        A webhook that ran but returned an invalid response still counts as
+        delivered, so those recipients are not contacted again.
+        """
+        field = self.automations[automation_name].get("mark_contacted")
+        if not field or not params:
+            return
+        if result.get("status") == "error" and not result.get("delivered") and not result.get("chunks"):
+            return
+        
+        recipients = params.get(field)
+        if not isinstance(recipients, list) or not recipients:
+            return
+        
+        # With a fan-out, only chunks that reached the webhook count as contacted
+        failed_chunks = result.get("chunks", {}).get("failed_chunks")
+        if failed_chunks:
+            undelivered = {c["chunk"] for c in failed_chunks if not c.get("delivered")}
+            chunks = FanOut(self.automations[automation_name]["fan_out"]).split(recipients)
+            recipients = [r for i, chunk in enumerate(chunks) if i not in undelivered for r in chunk]
+        
+        self.get_dedup_index().add_many(recipients)
+    
+    def params_from_previous(self, results):
+        """Pass leads from the last successful step on to the next one.
+
+        Only the recipient list is forwarded when the leads have emails, so a
+        fanned-out send does not carry every lead in every chunk.
+        """
+        if not results or not results[-1].get("success"):
+            return {}
+        
+        data = results[-1]["result"].get("data")
+        if not isinstance(data, dict) or not isinstance(data.get("leads"), list):
+            return {}
+        
+        leads = data["leads"]
+        emails = []
+        for lead in leads:
+            email = lead.get("email") if isinstance(lead, dict) else lead
+            if isinstance(email, str) and "@" in email:
+                emails.append(email)
+        return {"emails": emails} if emails else {"leads": leads}
+    
+    def _post_webhook(self, automation_name, webhook_url, payload, snapshot):
+        """POST a payload to a webhook and validate the JSON response against `snapshot`"""
         try:
             response = requests.post(webhook_url, json=payload, timeout=30)
             
@@ -170,21 +301,26 @@ If no good match, reply with "NONE"."""
                     response_data = response.json()
                     
                     # Validate response
-                    is_valid, error_msg = self.validate_response(automation_name, response_data)
+                    is_valid, error_msg = self.validate_response(automation_name, response_data, snapshot)
                     if not is_valid:
+                        # The webhook ran, so this must not be retried
                         return {
                             "status": "error",
                             "message": f"Response validation failed: {error_msg}",
-                            "data": response_data
+                            "data": response_data,
+                            "delivered": True
                         }
                     
                     return {"status": "success", "data": response_data}
                 except:
                     return {"status": "success", "message": response.text or "Completed"}
             else:
-                return {"status": "error", "code": response.status_code, "message": response.text}
+                return {"status": "error", "code": response.status_code, "message": response.text,
+                        "retryable": response.status_code >= 500}
         except requests.exceptions.Timeout:
-            return {"status": "error", "message": "Request timed out"}
+            return {"status": "error", "message": "Request timed out", "retryable": True}
+        except requests.exceptions.ConnectionError as e:
+            return {"status": "error", "message": str(e), "retryable": True}
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
@@ -196,23 +332,81 @@ Result: {json.dumps(result, indent=2)}
 
 Provide a clear, concise summary for the user. If there's an error, explain what went wrong and suggest a fix."""
         
-        if self.llm_provider == "openai":
-            response = self.client.chat.completions.create(
-                model=self.model,
-                max_tokens=500,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            return response.choices[0].message.content
-        else:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=500,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            return response.content[0].text
+        return self.llm.complete("analyze_result", prompt, max_tokens=500)
+    
+    def format_raw_result(self, result):
+        """Status, message and data of a result, shown while its summary is deferred"""
+        lines = [f"{bold('Status:')} {result.get('status', 'unknown')}"]
+        if result.get("message"):
+            lines.append(f"{bold('Message:')} {result['message']}")
+        if result.get("data") is not None:
+            lines.append(json.dumps(result["data"], indent=2, default=str))
+        return "\n".join(lines)
+    
+    def add_history(self, entry):
+        """Store a history entry; returns its compact in-memory summary (with id)"""
+        return self.history.add(entry)
+    
+    def summarize(self, entry, result, user_input):
+        """Analyze a result now, or hand it to the background pool in deferred mode.
+
+        Returns the analysis text, or None when it was deferred; the text is
+        stored on the history entry as "analysis" once ready.
+        """
+        if not self.defer_analysis:
+            analysis = self.analyze_result(result, user_input)
+            self.history.set_analysis(entry["id"], analysis)
+            return analysis
+        
+        if self.analysis_pool is None:
+            workers = int(os.getenv("ANALYSIS_WORKERS", 2))
+            self.analysis_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis")
+        
+        # Only unfinished analyses are tracked; finished ones live in the history store
+        future = self.analysis_pool.submit(self._background_analysis, entry, result, user_input)
+        self.pending_analyses[entry["id"]] = future
+        future.add_done_callback(lambda _: self.pending_analyses.pop(entry["id"], None))
+        return None
+    
+    def _background_analysis(self, entry, result, user_input):
+        try:
+            analysis = self.analyze_result(result, user_input)
+        except LLMBudgetExceeded as e:
+            self.analytics.track_budget_exceeded(str(e))
+            analysis = f"Analysis failed: {e}"
+        except Exception as e:
+            analysis = f"Analysis failed: {e}"
+        self.history.set_analysis(entry["id"], analysis)
+        return analysis
+    
+    def get_analysis(self, entry_id, wait=False, timeout=None):
+        """Return the analysis for a history entry; None while it is still pending
+        (unless wait=True, which blocks up to `timeout` seconds)"""
+        future = self.pending_analyses.get(entry_id)
+        if future is None:
+            entry = self.history.get(entry_id)
+            return entry.get("analysis") if entry else None
+        
+        if not wait and not future.done():
+            return None
+        return future.result(timeout=timeout)
+    
+    def wait_for_analyses(self, entry_ids=None, timeout=None):
+        """Block until the deferred analyses of `entry_ids` (default: all still
+        pending) are done; returns {entry_id: analysis}"""
+        if entry_ids is None:
+            entry_ids = list(self.pending_analyses)
+        return {entry_id: self.get_analysis(entry_id, wait=True, timeout=timeout)
+                for entry_id in entry_ids}
     
     def detect_multi_step(self, user_input):
         """Detect if user wants to chain multiple automations"""
+        cached_plan, similarity = self.plan_cache.lookup(user_input, self.automations)
+        self.analytics.track_plan_cache(cached_plan is not None)
+        if cached_plan:
+            print(dim(f"♻ Reusing cached plan (similarity {similarity:.2f})"))
+            return cached_plan
+        
         prompt = f"""Analyze this request: "{user_input}"
 
 Does this require multiple steps/automations to complete?
@@ -228,30 +422,20 @@ Reply with JSON:
   "automations": ["automation1", "automation2"]
 }}
 
-Available automations: {list(self.automations.keys())}
+Available automations: {list(self.candidate_automations(user_input).keys())}
 """
         
-        if self.llm_provider == "openai":
-            response = self.client.chat.completions.create(
-                model=self.model,
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            result = response.choices[0].message.content.strip()
-        else:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            result = response.content[0].text.strip()
+        result = self.llm.complete("detect_multi_step", prompt, max_tokens=300).strip()
         
         try:
             # Extract JSON from response
             import re
             json_match = re.search(r'\{.*\}', result, re.DOTALL)
             if json_match:
-                return json.loads(json_match.group())
+                plan = json.loads(json_match.group())
+                if plan.get("is_multi_step") and len(plan.get("automations", [])) > 1:
+                    self.plan_cache.store(user_input, plan)
+                return plan
             return {"is_multi_step": False}
         except:
             return {"is_multi_step": False}
@@ -317,7 +501,7 @@ Available automations: {list(self.automations.keys())}
             
             # Execute automation
             try:
-                result = self.execute_automation(automation, user_input, {})
+                result = self.execute_automation(automation, user_input, self.params_from_previous(results))
                 
                 if result.get("status") == "error":
                     err_detail = result.get("message", "Unknown error")
@@ -341,6 +525,9 @@ Available automations: {list(self.automations.keys())}
                     # Show validation status
                     if result.get("data"):
                         print(f"   {dim('✓ Response validated')}")
+                        suppressed = result["data"].get("duplicates_suppressed")
+                        if suppressed:
+                            print(f"   {dim(f'✓ {suppressed} previously contacted lead(s) removed')}")
                     
                     self.analytics.track_execution("multi_step", automation_name=automation, status="success")
                     
@@ -397,40 +584,11 @@ Available automations: {list(self.automations.keys())}
             print(box("ℹ INFO", "Some steps were skipped due to missing automations.", "info"))
         else:
             print(box("✓ SUCCESS", "All steps completed successfully!", "success"))
-        """Suggest relevant automations based on user input using LLM"""
-        automation_list = "\n".join([f"- {name}: {data['description']}" 
-                                     for name, data in self.automations.items()])
-        
-        prompt = f"""User wants: "{user_input}"
-
-Available automations:
-{automation_list}
-
-Suggest 2-3 most relevant automations that could help. Explain why each would be useful.
-Format: "• automation_name - reason why it's relevant"
-"""
-        
-        if self.llm_provider == "openai":
-            response = self.client.chat.completions.create(
-                model=self.model,
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            suggestions = response.choices[0].message.content
-        else:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            suggestions = response.content[0].text
-        
-        return f"❓ No exact match found. Here are some suggestions:\n\n{suggestions}\n\nTry: ./zin \"<automation_name>\""
     
     def suggest_automations(self, user_input):
         """Suggest relevant automations based on user input using LLM"""
         automation_list = "\n".join([f"- {name}: {data['description']}" 
-                                     for name, data in self.automations.items()])
+                                     for name, data in self.candidate_automations(user_input).items()])
         
         prompt = f"""User wants: "{user_input}"
 
@@ -441,20 +599,7 @@ Suggest 2-3 most relevant automations that could help. Explain why each would be
 Format: "• automation_name - reason why it's relevant"
 """
         
-        if self.llm_provider == "openai":
-            response = self.client.chat.completions.create(
-                model=self.model,
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            suggestions = response.choices[0].message.content
-        else:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            suggestions = response.content[0].text
+        suggestions = self.llm.complete("suggest_automations", prompt, max_tokens=300)
         
         warn_msg = warning('No exact match found.')
         info_msg = info('Suggestions:')
@@ -462,6 +607,18 @@ Format: "• automation_name - reason why it's relevant"
         return f"{warn_msg}\n\n{info_msg}\n{suggestions}\n\n{hint_msg}"
     
     def run(self, user_input):
+        """Main execution flow, pinned to one registry snapshot for the whole request"""
+        self._local.snapshot = self.registry.refresh()
+        try:
+            return self._run(user_input)
+        except LLMBudgetExceeded as e:
+            self.analytics.track_budget_exceeded(str(e))
+            self.analytics.end_tracking()
+            return error(f"{e}. Try again tomorrow or raise LLM_DAILY_TOKEN_BUDGET.")
+        finally:
+            self._local.snapshot = None
+    
+    def _run(self, user_input):
         """Main execution flow with enhanced features"""
         self.analytics.start_tracking()
         
@@ -470,24 +627,27 @@ Format: "• automation_name - reason why it's relevant"
         if any(word in lower_input for word in ["how many", "list", "show", "what automations", "available"]):
             if any(word in lower_input for word in ["automation", "workflow"]):
                 count = len(self.automations)
-                print(f"\n{info(f'Total automations: {bold(str(count))}')}\n")
-                print(table(["Automation", "Description"], 
-                           [[name, data["description"]] for name, data in self.automations.items()]))
+                with self.profiler.phase("render"):
+                    print(f"\n{info(f'Total automations: {bold(str(count))}')}")
+                    stream_table(["Automation", "Description"],
+                                 ([name, data["description"]] for name, data in self.automations.items()))
                 self.analytics.end_tracking()
                 return ""
         
         # Check for multi-step workflow
-        multi_step = self.detect_multi_step(user_input)
+        with self.profiler.phase("plan"):
+            multi_step = self.detect_multi_step(user_input)
         
         if multi_step.get("is_multi_step") and len(multi_step.get("automations", [])) > 1:
             # Execute workflow chain
             workflow_name = multi_step.get("workflow_name", "custom_workflow")
             self.analytics.track_execution("multi_step", workflow_name=workflow_name)
             
-            results = self.execute_workflow_chain(multi_step, user_input)
+            with self.profiler.phase("execute"):
+                results = self.execute_workflow_chain(multi_step, user_input)
             
             # Store in history
-            self.history.append({
+            entry = self.add_history({
                 "input": user_input,
                 "type": "multi_step",
                 "steps": results,
@@ -495,16 +655,28 @@ Format: "• automation_name - reason why it's relevant"
             })
             
             # Analyze combined results
-            analysis = self.analyze_result({"multi_step_results": results}, user_input)
+            with self.profiler.phase("analyze"):
+                analysis = self.summarize(entry, {"multi_step_results": results}, user_input)
             
             self.analytics.end_tracking()
-            self.analytics.display_analytics()
+            with self.profiler.phase("render"):
+                self.analytics.display_analytics()
             
+            if analysis is None:
+                pending_msg = f"Summary #{entry['id']} is being prepared in the background"
+                sections = []
+                for r in results:
+                    step_title = f"Step {r['step']}: {r['automation']}"
+                    sections.append(f"{bold(step_title)}\n{self.format_raw_result(r['result'])}")
+                step_results = "\n\n".join(sections)
+                return f"\n{header('📝 DETAILED RESULTS')}{step_results}\n\n{dim(pending_msg)}"
             return f"\n{header('📝 DETAILED RESULTS')}{analysis}"
         
         # Single automation flow
-        params = self.extract_parameters(user_input)
-        match_data = self.find_automation(user_input)
+        with self.profiler.phase("extract"):
+            params = self.extract_parameters(user_input)
+        with self.profiler.phase("route"):
+            match_data = self.find_automation(user_input)
         
         if not match_data:
             self.analytics.end_tracking()
@@ -521,7 +693,16 @@ Format: "• automation_name - reason why it's relevant"
                     print(f"  • {key}: {value}")
         print()
         
-        result = self.execute_automation(automation, user_input, params)
+        with self.profiler.phase("execute"):
+            result = self.execute_automation(automation, user_input, params)
+        
+        if result.get("chunks"):
+            chunks = result["chunks"]
+            chunk_msg = f"Sent in {chunks['total']} chunks"
+            chunk_detail = f"({chunks['succeeded']} succeeded, {chunks['failed']} failed)"
+            print(f"{info(chunk_msg)} {dim(chunk_detail)}")
+            if result.get("status") == "partial":
+                print(f"{warning(result['message'])}\n")
         
         # Handle errors
         if result.get("status") == "error":
@@ -531,7 +712,7 @@ Format: "• automation_name - reason why it's relevant"
             self.analytics.track_execution("single", automation_name=automation, status="failed", params=params, error=error_msg)
             
             # Store in history
-            self.history.append({
+            self.add_history({
                 "input": user_input,
                 "type": "single",
                 "automation": automation,
@@ -541,14 +722,15 @@ Format: "• automation_name - reason why it's relevant"
             })
             
             self.analytics.end_tracking()
-            self.analytics.display_analytics()
+            with self.profiler.phase("render"):
+                self.analytics.display_analytics()
             
             return error(f"Automation failed: {error_msg}")
         
         self.analytics.track_execution("single", automation_name=automation, status="success", params=params)
         
         # Store in history
-        self.history.append({
+        entry = self.add_history({
             "input": user_input,
             "type": "single",
             "automation": automation,
@@ -557,20 +739,37 @@ Format: "• automation_name - reason why it's relevant"
             "status": "success"
         })
         
-        analysis = self.analyze_result(result, user_input)
+        with self.profiler.phase("analyze"):
+            analysis = self.summarize(entry, result, user_input)
         
         self.analytics.end_tracking()
-        self.analytics.display_analytics()
+        with self.profiler.phase("render"):
+            self.analytics.display_analytics()
         
+        if analysis is None:
+            pending_msg = f"Summary #{entry['id']} is being prepared in the background"
+            return f"\n{success('Completed successfully!')}\n\n{self.format_raw_result(result)}\n\n{dim(pending_msg)}"
         return f"\n{success('Completed successfully!')}\n\n{analysis}"
 
 if __name__ == "__main__":
     import sys
-    agent = MasterAgent()
+    args = sys.argv[1:]
+    profile = "--profile" in args
+    args = [arg for arg in args if arg != "--profile"]
+    agent = MasterAgent(profile=profile)
     
-    if len(sys.argv) > 1:
-        user_input = " ".join(sys.argv[1:])
+    if args:
+        user_input = " ".join(args)
     else:
         user_input = input("Enter command: ")
     
     print(agent.run(user_input))
+    
+    # Deferred mode: the raw result is already printed, summaries follow when ready
+    session_ids = [summary["id"] for summary in agent.history] if agent.defer_analysis else []
+    for entry_id, analysis in agent.wait_for_analyses(session_ids).items():
+        if analysis is None:
+            continue
+        print(f"\n{header(f'📝 SUMMARY #{entry_id}')}{analysis}")
+    
+    agent.profiler.report()
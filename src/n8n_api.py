@@ -3,58 +3,181 @@
 import os
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from catalog import AutomationCatalog, STICKY_NOTE_NODE, WEBHOOK_NODE
+
+PAGE_SIZE = 100
+PROVISION_WORKERS = 4
+MANAGED_NODES = {"Webhook", "Respond", "Description"}
 
 class N8nAPI:
     def __init__(self):
-        self.base_url = "http://localhost:5678/api/v1"
+        self.base_url = os.getenv("N8N_BASE_URL", "http://localhost:5678").rstrip("/") + "/api/v1"
         self.api_key = os.getenv("N8N_API_KEY")
         self.headers = {"X-N8N-API-KEY": self.api_key}
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
     
-    def create_workflow(self, name, webhook_path, description=""):
-        """Create a simple webhook workflow"""
-        workflow = {
-            "name": name,
-            "active": True,
-            "nodes": [
-                {
-                    "parameters": {
-                        "httpMethod": "POST",
-                        "path": webhook_path,
-                        "responseMode": "responseNode"
-                    },
-                    "name": "Webhook",
-                    "type": "n8n-nodes-base.webhook",
-                    "position": [250, 300],
-                    "webhookId": "",
-                    "typeVersion": 1
+    def workflow_body(self, name, webhook_path, description=""):
+        """Build a simple webhook workflow; webhook_path is the path after /webhook/"""
+        nodes = [
+            {
+                "parameters": {
+                    "httpMethod": "POST",
+                    "path": webhook_path,
+                    "responseMode": "responseNode"
+                },
+                "name": "Webhook",
+                "type": "n8n-nodes-base.webhook",
+                "position": [250, 300],
+                "webhookId": "",
+                "typeVersion": 1
+            },
+            {
+                "parameters": {
+                    "respondWith": "json",
+                    "responseBody": '={{ $json }}'
                 },
-                {
-                    "parameters": {
-                        "respondWith": "json",
-                        "responseBody": '={{ $json }}'
-                    },
-                    "name": "Respond",
-                    "type": "n8n-nodes-base.respondToWebhook",
-                    "position": [450, 300],
-                    "typeVersion": 1
-                }
-            ],
+                "name": "Respond",
+                "type": "n8n-nodes-base.respondToWebhook",
+                "position": [450, 300],
+                "typeVersion": 1
+            }
+        ]
+        if description:
+            nodes.append({
+                "parameters": {"content": description},
+                "name": "Description",
+                "type": STICKY_NOTE_NODE,
+                "position": [250, 120],
+                "typeVersion": 1
+            })
+        
+        return {
+            "name": name,
+            "nodes": nodes,
             "connections": {
                 "Webhook": {"main": [[{"node": "Respond", "type": "main", "index": 0}]]}
-            }
+            },
+            "settings": {}
         }
-        
-        response = requests.post(
-            f"{self.base_url}/workflows",
-            headers=self.headers,
-            json=workflow
-        )
+    
+    def create_workflow(self, name, webhook_path, description=""):
+        """Create a simple webhook workflow and activate it"""
+        response = self.session.post(f"{self.base_url}/workflows",
+                                     json=self.workflow_body(name, webhook_path, description), timeout=30)
+        response.raise_for_status()
+        workflow = response.json()
+        self.activate_workflow(workflow["id"])
+        return workflow
+    
+    def update_workflow(self, workflow_id, name, webhook_path, description=""):
+        """Replace a workflow's name and nodes"""
+        response = self.session.put(f"{self.base_url}/workflows/{workflow_id}",
+                                    json=self.workflow_body(name, webhook_path, description), timeout=30)
+        response.raise_for_status()
         return response.json()
     
+    def activate_workflow(self, workflow_id):
+        response = self.session.post(f"{self.base_url}/workflows/{workflow_id}/activate", timeout=30)
+        response.raise_for_status()
+        return response.json()
+    
+    def iter_workflows(self, page_size=PAGE_SIZE):
+        """Yield every workflow, following the API's nextCursor pagination"""
+        params = {"limit": page_size, "excludePinnedData": "true"}
+        while True:
+            response = self.session.get(f"{self.base_url}/workflows", params=params, timeout=30)
+            response.raise_for_status()
+            page = response.json()
+            yield from page.get("data", [])
+            
+            cursor = page.get("nextCursor")
+            if not cursor:
+                break
+            params["cursor"] = cursor
+    
     def list_workflows(self):
         """List all workflows"""
-        response = requests.get(f"{self.base_url}/workflows", headers=self.headers)
-        return response.json()
+        return {"data": list(self.iter_workflows())}
+    
+    def sync_catalog(self, catalog=None):
+        """Refresh the local automation catalog from the live workflows"""
+        catalog = catalog or AutomationCatalog()
+        stats = catalog.sync(self.iter_workflows())
+        catalog.save()
+        return catalog, stats
+    
+    def plan_provisioning(self, automations, workflows):
+        """Diff the registry against live workflows.
+
+        Returns a list of actions: "create" for webhook paths with no workflow,
+        "update" for workflows we created whose name or description drifted,
+        "activate" for inactive ones, "unchanged" otherwise. Hand-built
+        workflows (not of our webhook/respond shape) are never rewritten.
+        """
+        existing = {}
+        for workflow in workflows:
+            for node in workflow.get("nodes", []):
+                if node.get("type") == WEBHOOK_NODE and node.get("parameters", {}).get("path"):
+                    existing.setdefault(node["parameters"]["path"].strip("/"), workflow)
+        
+        actions = []
+        seen_paths = set()
+        for name, data in automations.items():
+            path = data["webhook_path"].split("/webhook/", 1)[-1].strip("/")
+            if path in seen_paths:
+                continue
+            seen_paths.add(path)
+            
+            desired = {"automation": name, "path": path, "description": data.get("description", "")}
+            workflow = existing.get(path)
+            if workflow is None:
+                actions.append({**desired, "action": "create"})
+                continue
+            
+            desired["workflow_id"] = workflow["id"]
+            node_names = {node.get("name") for node in workflow.get("nodes", [])}
+            notes = [node.get("parameters", {}).get("content", "") for node in workflow.get("nodes", [])
+                     if node.get("type") == STICKY_NOTE_NODE]
+            managed = node_names <= MANAGED_NODES
+            drifted = workflow.get("name") != name or (notes[0] if notes else "") != desired["description"]
+            
+            if managed and drifted:
+                actions.append({**desired, "action": "update", "activate": not workflow.get("active")})
+            elif not workflow.get("active"):
+                actions.append({**desired, "action": "activate"})
+            else:
+                actions.append({**desired, "action": "unchanged"})
+        return actions
+    
+    def _apply(self, action):
+        try:
+            if action["action"] == "create":
+                workflow = self.create_workflow(action["automation"], action["path"], action["description"])
+                action["workflow_id"] = workflow.get("id")
+            elif action["action"] == "update":
+                self.update_workflow(action["workflow_id"], action["automation"], action["path"], action["description"])
+                if action.get("activate"):
+                    self.activate_workflow(action["workflow_id"])
+            elif action["action"] == "activate":
+                self.activate_workflow(action["workflow_id"])
+            action["status"] = "ok"
+        except requests.RequestException as e:
+            action["status"] = "error"
+            action["message"] = str(e)
+        return action
+    
+    def provision(self, automations, dry_run=False, max_workers=PROVISION_WORKERS):
+        """Create, update or activate only the workflows that differ from the registry"""
+        actions = self.plan_provisioning(automations, self.iter_workflows())
+        pending = [a for a in actions if a["action"] != "unchanged"]
+        if dry_run or not pending:
+            return actions
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(self._apply, pending))
+        return actions
 
 if __name__ == "__main__":
     import sys
@@ -69,7 +192,35 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "list":
         workflows = api.list_workflows()
         print(json.dumps(workflows, indent=2))
+    elif len(sys.argv) > 1 and sys.argv[1] == "sync":
+        catalog, stats = api.sync_catalog()
+        print(f"✅ Synced {len(catalog.automations)} automation(s) to {catalog.path}")
+        print(f"   added: {stats['added']}, updated: {stats['updated']}, "
+              f"unchanged: {stats['unchanged']}, removed: {stats['removed']}")
+    elif len(sys.argv) > 1 and sys.argv[1] == "provision":
+        with open("config/automations.json", "r") as f:
+            automations = json.load(f)
+        dry_run = "--dry-run" in sys.argv
+        actions = api.provision(automations, dry_run=dry_run)
+        
+        icons = {"create": "➕", "update": "✏️ ", "activate": "▶️ ", "unchanged": "✓"}
+        for action in actions:
+            status = action.get("status", "planned" if dry_run and action["action"] != "unchanged" else "")
+            line = f"{icons[action['action']]} {action['action']:<9} {action['automation']} (/webhook/{action['path']})"
+            if status == "error":
+                line += f" ❌ {action['message']}"
+            elif status:
+                line += f" [{status}]"
+            print(line)
+        
+        failed = [a for a in actions if a.get("status") == "error"]
+        changed = [a for a in actions if a["action"] != "unchanged"]
+        print(f"\n{len(changed)} change(s), {len(failed)} failed, {len(actions) - len(changed)} unchanged")
+        if failed:
+            sys.exit(1)
     else:
         print("Usage:")
         print("  export N8N_API_KEY='your-key'")
         print("  python3 n8n_api.py list")
+        print("  python3 n8n_api.py sync")
+        print("  python3 n8n_api.py provision [--dry-run]")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Similarity cache of multi-step plans, so rephrased requests skip the planning LLM call.
+
+Requests are embedded offline as hashed character trigrams (no external
+service). An inverted index over the hashed features means a lookup only
+touches cached plans that share features with the query.
+
+Trigram similarity alone cannot tell "email them" from "do not email them",
+or "send them emails" from "send them proposals", so it only shortlists
+candidates. A plan is reused only when both requests reduce to the same
+intent key: their content words, stemmed and with synonyms folded, where a
+word following a negation is kept as "!word".
+"""
+import os
+import re
+import json
+import math
+import time
+import zlib
+import threading
+from routing import stem
+
+DEFAULT_CACHE_PATH = "data/plan_cache.json"
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_MAX_ENTRIES = 1000
+NGRAM = 3
+DIMENSIONS = 1 << 18
+
+# Connectives and generic verbs that do not change which automations a plan uses
+FILLER_WORDS = {
+    "a", "an", "the", "and", "but", "then", "after", "that", "to", "for", "on", "in", "of",
+    "with", "from", "by", "at", "all", "some", "any", "them", "they", "their", "it",
+    "me", "us", "we", "i", "you", "my", "our", "please", "can", "could", "would",
+    "find", "get", "fetch", "search", "look", "pull", "grab", "send", "do", "run", "make",
+}
+NEGATIONS = {"not", "no", "never", "dont", "doesnt", "didnt", "cannot", "cant", "wont",
+             "without", "except", "skip", "nor"}
+SYNONYMS = {"prospect": "lead", "contact": "lead", "mail": "email", "e": "email", "subreddit": "reddit"}
+
+
+def vectorize(text):
+    """L2-normalized sparse vector of hashed character n-grams"""
+    normalized = " " + " ".join(re.findall(r"[a-z0-9]+", text.lower())) + " "
+    counts = {}
+    for i in range(len(normalized) - NGRAM + 1):
+        feature = zlib.crc32(normalized[i:i + NGRAM].encode()) % DIMENSIONS
+        counts[feature] = counts.get(feature, 0) + 1
+    norm = math.sqrt(sum(c * c for c in counts.values())) or 1.0
+    return {feature: c / norm for feature, c in counts.items()}
+
+
+def intent_key(text):
+    """Order-free set of content terms; a term right after a negation becomes !term"""
+    key = set()
+    negated = False
+    for token in re.findall(r"[a-z0-9]+", text.lower().replace("'", "")):
+        if token in NEGATIONS:
+            negated = True
+            continue
+        if token in FILLER_WORDS:
+            continue
+        term = SYNONYMS.get(stem(token), stem(token))
+        key.add(f"!{term}" if negated else term)
+        negated = False
+    return frozenset(key)
+
+
+class PlanCache:
+    """Persistent nearest-neighbour cache of `detect_multi_step` plans"""
+    def __init__(self, path=None, threshold=None, max_entries=None):
+        self.path = path or os.getenv("PLAN_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.threshold = threshold or float(os.getenv("PLAN_CACHE_THRESHOLD", DEFAULT_THRESHOLD))
+        self.max_entries = max_entries or int(os.getenv("PLAN_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+        self.lock = threading.Lock()
+        self.entries = {}   # id -> {"input", "plan", "last_used", "vector", "key"}
+        self.postings = {}  # feature -> {id: weight}
+        self.next_id = 0
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                stored = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        for entry in stored:
+            self._insert(entry["input"], entry["plan"], entry.get("last_used", 0))
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        stored = [{"input": e["input"], "plan": e["plan"], "last_used": e["last_used"]}
+                  for e in self.entries.values()]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(stored, f)
+        os.replace(tmp_path, self.path)
+
+    def _insert(self, user_input, plan, last_used):
+        entry_id = self.next_id
+        self.next_id += 1
+        vector = vectorize(user_input)
+        self.entries[entry_id] = {"input": user_input, "plan": plan, "last_used": last_used,
+                                  "vector": vector, "key": intent_key(user_input)}
+        for feature, weight in vector.items():
+            self.postings.setdefault(feature, {})[entry_id] = weight
+
+    def _remove(self, entry_id):
+        entry = self.entries.pop(entry_id)
+        for feature in entry["vector"]:
+            docs = self.postings[feature]
+            docs.pop(entry_id, None)
+            if not docs:
+                del self.postings[feature]
+
+    def lookup(self, user_input, automations):
+        """Return (plan, similarity) of the closest cached plan above the threshold
+        with the same intent key and whose automations all still exist,
+        else (None, best_similarity)"""
+        query = vectorize(user_input)
+        key = intent_key(user_input)
+        with self.lock:
+            scores = {}
+            for feature, weight in query.items():
+                for entry_id, entry_weight in self.postings.get(feature, {}).items():
+                    scores[entry_id] = scores.get(entry_id, 0) + weight * entry_weight
+
+            best = 0.0
+            for entry_id, score in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+                best = max(best, score)
+                if score < self.threshold:
+                    break
+                entry = self.entries[entry_id]
+                if entry["key"] != key:
+                    continue
+                if all(name in automations for name in entry["plan"].get("automations", [])):
+                    entry["last_used"] = time.time()
+                    return json.loads(json.dumps(entry["plan"])), score
+            return None, best
+
+    def store(self, user_input, plan):
+        with self.lock:
+            for entry_id, entry in list(self.entries.items()):
+                if entry["input"] == user_input:
+                    self._remove(entry_id)
+            self._insert(user_input, plan, time.time())
+            while len(self.entries) > self.max_entries:
+                oldest = min(self.entries, key=lambda entry_id: self.entries[entry_id]["last_used"])
+                self._remove(oldest)
+            self.save()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Per-phase cProfile + tracemalloc profiling for MasterAgent.run (--profile)"""
+import os
+import io
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from styling import *
+
+TOP_FUNCTIONS = 5
+TOP_ALLOCATIONS = 3
+# Leave out tracemalloc's and the profiler's own bookkeeping so the top sites are the agent's code
+SNAPSHOT_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+
+_DISABLED = nullcontext()
+
+
+class PhaseProfiler:
+    """Collects CPU and allocation stats per named phase, accumulated across runs.
+
+    Phases do not nest: a phase opened while another is active is counted as
+    part of the outer one.
+    """
+    def __init__(self, enabled=False, output_dir=None):
+        self.enabled = enabled
+        self.output_dir = output_dir or os.path.join("profiles", datetime.now().strftime("%Y%m%d-%H%M%S"))
+        self.profiles = {}
+        self.peaks = {}
+        self.allocations = {}
+        self.calls = {}
+        self.active = None
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def phase(self, name):
+        if not self.enabled or self.active:
+            return _DISABLED
+        return self._profile(name)
+
+    @contextmanager
+    def _profile(self, name):
+        self.active = name
+        profile = self.profiles.setdefault(name, cProfile.Profile())
+        before = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        start_memory = tracemalloc.get_traced_memory()[0]
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            peak = tracemalloc.get_traced_memory()[1] - start_memory
+            after = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+            self.peaks[name] = max(self.peaks.get(name, 0), peak)
+            self.allocations[name] = after.compare_to(before, "lineno")[:TOP_ALLOCATIONS]
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self.active = None
+
+    def report(self):
+        """Write <phase>.prof / <phase>.alloc.txt files and print the hotspots per phase"""
+        if not self.enabled or not self.profiles:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        print(header("🔬 PROFILE"))
+        rows = []
+        for name, profile in self.profiles.items():
+            profile.dump_stats(os.path.join(self.output_dir, f"{name}.prof"))
+            with open(os.path.join(self.output_dir, f"{name}.alloc.txt"), "w") as f:
+                f.write("\n".join(str(stat) for stat in self.allocations.get(name, [])) + "\n")
+
+            stats = pstats.Stats(profile)
+            rows.append([name, str(self.calls[name]), f"{stats.total_tt:.3f}s", f"{self.peaks[name] / 1024:.1f} KiB"])
+
+        print(table(["Phase", "Runs", "Time", "Peak Memory"], rows))
+
+        for name, profile in self.profiles.items():
+            print(f"\n{bold(f'🔥 {name}')}")
+            out = io.StringIO()
+            pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            lines = [line for line in out.getvalue().splitlines() if line.strip()]
+            start = next((i for i, line in enumerate(lines) if line.lstrip().startswith("ncalls")), 0)
+            for line in lines[start:start + TOP_FUNCTIONS + 1]:
+                print(f"  {dim(line)}")
+            for stat in self.allocations.get(name, []):
+                print(f"  {dim(f'alloc {stat}')}")
+
+        print(f"\n{info(f'Stats written to {self.output_dir}/')} {dim('(open with: python3 -m pstats <file>.prof)')}\n")
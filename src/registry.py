@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Hot-reloading automation registry with immutable snapshots"""
+import os
+import time
+import threading
+from routing import RoutingIndex
+
+DEFAULT_CHECK_INTERVAL = 5  # seconds between file stat checks
+
+TYPE_CHECKS = {
+    "array": list,
+    "number": (int, float),
+    "string": str,
+}
+
+
+def compile_validator(expected):
+    """Turn an expected_response schema into a validator function"""
+    if not expected:
+        return None
+
+    required_fields = list(expected.get("required_fields", []))
+    typed_fields = [(field, expected_type, TYPE_CHECKS[expected_type])
+                    for field, expected_type in expected.items()
+                    if field != "required_fields" and expected_type in TYPE_CHECKS]
+
+    def validate(response_data):
+        # Check required fields
+        for field in required_fields:
+            if field not in response_data:
+                return False, f"Missing required field: {field}"
+
+        # Type validation
+        for field, expected_type, python_type in typed_fields:
+            if field in response_data and not isinstance(response_data[field], python_type):
+                return False, f"Field '{field}' should be {expected_type}, got {type(response_data[field]).__name__}"
+
+        return True, None
+
+    return validate
+
+
+class RegistrySnapshot:
+    """One consistent view of the registry; never mutated after it is built"""
+    def __init__(self, automations, loaded_at):
+        self.automations = automations
+        self.loaded_at = loaded_at
+        self.validators = {name: compile_validator(data.get("expected_response"))
+                           for name, data in automations.items()}
+        self.routing_index = RoutingIndex(automations)
+
+
+class AutomationRegistry:
+    """Holds the current snapshot and swaps in a new one when the source files change.
+
+    Change detection is a stat() of each watched file (mtime + size), done at
+    most once every `check_interval` seconds, so calling refresh() per request
+    is cheap.
+    """
+    def __init__(self, loader, paths, check_interval=None, on_reload=None):
+        self.loader = loader
+        self.paths = list(paths)
+        if check_interval is None:
+            check_interval = float(os.getenv("REGISTRY_RELOAD_INTERVAL", DEFAULT_CHECK_INTERVAL))
+        self.check_interval = check_interval
+        self.on_reload = on_reload
+        self.lock = threading.Lock()
+        self.last_check = time.monotonic()
+        self.signature = self._signature()
+        self.snapshot = RegistrySnapshot(loader(), time.time())
+
+    def _signature(self):
+        signature = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def refresh(self):
+        """Return the current snapshot, reloading first if a watched file changed"""
+        now = time.monotonic()
+        if now - self.last_check < self.check_interval:
+            return self.snapshot
+
+        with self.lock:
+            if now - self.last_check < self.check_interval:
+                return self.snapshot
+            self.last_check = now
+
+            signature = self._signature()
+            if signature == self.signature:
+                return self.snapshot
+
+            started = time.perf_counter()
+            try:
+                snapshot = RegistrySnapshot(self.loader(), time.time())
+            except ValueError:
+                # Half-written or invalid JSON: keep serving the old snapshot, retry next check
+                return self.snapshot
+            self.signature = signature
+            self.snapshot = snapshot
+
+        if self.on_reload:
+            self.on_reload(time.perf_counter() - started, len(snapshot.automations))
+        return snapshot
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Local candidate shortlisting so routing prompts stay constant-size"""
+import os
+import math
+import heapq
+from catalog import tokenize
+
+DEFAULT_TOP_K = 8
+DEFAULT_MIN_SCORE = 1.0      # best BM25 score below this is a weak match
+DEFAULT_MIN_MARGIN = 0.1     # best must beat the first left-out candidate by 10%
+DEFAULT_FALLBACK_SIZE = 40   # most automations sent when routing is not confident
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def stem(token):
+    """Very light stemming so "emails"/"email" and "messages"/"message" match"""
+    for suffix in ("ing", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)]
+    return token
+
+
+def terms(text):
+    return [stem(t) for t in tokenize(text.replace("_", " "))]
+
+
+class RoutingIndex:
+    """Inverted keyword index over automation names and descriptions, ranked with BM25"""
+    def __init__(self, automations):
+        self.names = list(automations)
+        self.postings = {}
+        self.doc_lengths = []
+
+        for doc_id, name in enumerate(self.names):
+            doc_terms = terms(f"{name} {automations[name].get('description', '')}")
+            self.doc_lengths.append(len(doc_terms))
+            counts = {}
+            for term in doc_terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, tf in counts.items():
+                self.postings.setdefault(term, []).append((doc_id, tf))
+
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0
+        total = len(self.names)
+        self.idf = {term: math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+                    for term, docs in self.postings.items()}
+
+    def rank(self, text, k):
+        """Return up to k (name, score) pairs with a non-zero score, best first"""
+        scores = {}
+        for term in set(terms(text)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, tf in self.postings[term]:
+                norm = K1 * (1 - B + B * self.doc_lengths[doc_id] / self.avg_length)
+                scores[doc_id] = scores.get(doc_id, 0) + idf * tf * (K1 + 1) / (tf + norm)
+
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self.names[doc_id], score) for doc_id, score in best]
+
+
+def shortlist(automations, index, text, k=None):
+    """Pick the automations worth showing the LLM for this input.
+
+    Returns the top k when the best match is confident: its score is at least
+    ROUTING_MIN_SCORE and beats the first candidate left out by
+    ROUTING_MIN_MARGIN. Otherwise (no match, a weak generic match, or a cut
+    through tied scores) it widens to ROUTING_FALLBACK_SIZE entries, best
+    ranked first and padded in registry order, so the prompt stays bounded.
+    The full registry is only sent when it is already that small.
+    """
+    if k is None:
+        k = int(os.getenv("ROUTING_TOP_K", DEFAULT_TOP_K))
+    if k <= 0 or len(automations) <= k:
+        return automations
+
+    min_score = float(os.getenv("ROUTING_MIN_SCORE", DEFAULT_MIN_SCORE))
+    min_margin = float(os.getenv("ROUTING_MIN_MARGIN", DEFAULT_MIN_MARGIN))
+    fallback_size = max(k, int(os.getenv("ROUTING_FALLBACK_SIZE", DEFAULT_FALLBACK_SIZE)))
+
+    ranked = index.rank(text, max(k + 1, fallback_size))
+    if ranked:
+        best = ranked[0][1]
+        cutoff = ranked[k][1] if len(ranked) > k else 0.0
+        if best >= min_score and best >= cutoff * (1 + min_margin):
+            return {name: automations[name] for name, _ in ranked[:k]}
+
+    if len(automations) <= fallback_size:
+        return automations
+    names = [name for name, _ in ranked[:fallback_size]]
+    chosen = set(names)
+    for name in automations:
+        if len(names) >= fallback_size:
+            break
+        if name not in chosen:
+            names.append(name)
+    return {name: automations[name] for name in names}
@@ -1,4 +1,12 @@
 """Terminal styling utilities for better output formatting"""
+import os
+import re
+import sys
+import itertools
+import unicodedata
+
+ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+TABLE_SAMPLE_ROWS = 100
 
 class Colors:
     # Basic colors
@@ -65,15 +73,15 @@ def box(title, content, status="info"):
     color = color_map.get(status, Colors.BRIGHT_BLUE)
     
     lines = content.split('\n')
-    max_len = max(len(line) for line in lines + [title])
+    max_len = max(display_width(line) for line in lines + [title])
     width = max_len + 4
     
     output = f"\n{color}┌{'─' * (width - 2)}┐{Colors.RESET}\n"
-    output += f"{color}│{Colors.RESET} {Colors.BOLD}{title}{Colors.RESET}{' ' * (width - len(title) - 3)}{color}│{Colors.RESET}\n"
+    output += f"{color}│{Colors.RESET} {Colors.BOLD}{title}{Colors.RESET}{' ' * (width - display_width(title) - 3)}{color}│{Colors.RESET}\n"
     output += f"{color}├{'─' * (width - 2)}┤{Colors.RESET}\n"
     
     for line in lines:
-        output += f"{color}│{Colors.RESET} {line}{' ' * (width - len(line) - 3)}{color}│{Colors.RESET}\n"
+        output += f"{color}│{Colors.RESET} {line}{' ' * (width - display_width(line) - 3)}{color}│{Colors.RESET}\n"
     
     output += f"{color}└{'─' * (width - 2)}┘{Colors.RESET}\n"
     return output
@@ -84,24 +92,103 @@ def progress_bar(current, total, width=30):
     percent = int(100 * current / total)
     return f"{Colors.BRIGHT_CYAN}[{bar}]{Colors.RESET} {percent}%"
 
+def display_width(text):
+    """Terminal columns taken by text: ANSI codes are zero-width, wide characters take two"""
+    text = ANSI_RE.sub('', str(text))
+    if text.isascii():
+        return len(text)
+    width = 0
+    for char in text:
+        if unicodedata.combining(char):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+    return width
+
+def pad(text, width):
+    """Pad text to at least `width` display columns (never truncates)"""
+    text = str(text)
+    return text + ' ' * (width - display_width(text))
+
+def wrap(text, width):
+    """Split text into pieces of at most `width` display columns.
+
+    Text that fits is returned as is; longer text loses its ANSI codes so
+    they are not cut in half.
+    """
+    text = str(text)
+    if display_width(text) <= width:
+        return [text]
+    pieces, current, current_width = [], "", 0
+    for char in ANSI_RE.sub('', text):
+        char_width = display_width(char)
+        if current and current_width + char_width > width:
+            pieces.append(current)
+            current, current_width = "", 0
+        current += char
+        current_width += char_width
+    pieces.append(current)
+    return pieces
+
+def _table_lines(headers, rows, col_widths):
+    """Yield the lines of a table one at a time.
+
+    The frame keeps `col_widths`; a cell wider than its column wraps onto
+    continuation lines, so no data is cut off.
+    """
+    yield "┌─" + "─┬─".join("─" * w for w in col_widths) + "─┐"
+    header_cells = " │ ".join(pad(h, w) for h, w in zip(headers, col_widths))
+    yield f"│ {Colors.BOLD}{header_cells}{Colors.RESET} │"
+    yield "├─" + "─┼─".join("─" * w for w in col_widths) + "─┤"
+    for row in rows:
+        cells = [wrap(cell, w) for cell, w in zip(row, col_widths)]
+        for line in range(max(len(pieces) for pieces in cells)):
+            yield "│ " + " │ ".join(pad(pieces[line] if line < len(pieces) else "", w)
+                                  for pieces, w in zip(cells, col_widths)) + " │"
+    yield "└─" + "─┴─".join("─" * w for w in col_widths) + "─┘"
+
+def _column_widths(headers, rows):
+    widths = [display_width(h) for h in headers]
+    for row in rows:
+        widths = [max(w, display_width(cell)) for w, cell in zip(widths, row)]
+    return widths
+
 def table(headers, rows):
     """Create a formatted table"""
-    col_widths = [max(len(str(row[i])) for row in [headers] + rows) for i in range(len(headers))]
+    col_widths = _column_widths(headers, rows)
+    return "\n" + "\n".join(_table_lines(headers, rows, col_widths)) + "\n"
+
+def stream_table(headers, rows, widths=None, out=None, max_rows=None):
+    """Write a table row by row as `rows` (any iterable) is consumed.
+
+    Column widths come from `widths` or from the first TABLE_SAMPLE_ROWS rows;
+    a longer cell later on wraps onto continuation lines within its column. When output is not a TTY, at most `max_rows`
+    rows are written (default TABLE_MAX_ROWS, 1000) followed by the total.
+    Memory use does not depend on the number of rows.
+    """
+    out = out or sys.stdout
+    rows = iter(rows)
+    sample = list(itertools.islice(rows, TABLE_SAMPLE_ROWS)) if widths is None else []
+    col_widths = widths or _column_widths(headers, sample)
     
-    def format_row(row, is_header=False):
-        formatted = " │ ".join(str(row[i]).ljust(col_widths[i]) for i in range(len(row)))
-        if is_header:
-            return f"{Colors.BOLD}{formatted}{Colors.RESET}"
-        return formatted
+    if max_rows is None and not out.isatty():
+        max_rows = int(os.getenv("TABLE_MAX_ROWS", 1000))
     
-    separator = "─┼─".join("─" * w for w in col_widths)
+    all_rows = itertools.chain(sample, rows)
+    shown = all_rows if max_rows is None else itertools.islice(all_rows, max_rows)
+    written = 0
     
-    output = "\n┌─" + "─┬─".join("─" * w for w in col_widths) + "─┐\n"
-    output += "│ " + format_row(headers, True) + " │\n"
-    output += "├─" + separator + "─┤\n"
+    def counted(rows):
+        nonlocal written
+        for row in rows:
+            written += 1
+            yield row
     
-    for row in rows:
-        output += "│ " + format_row(row) + " │\n"
+    out.write("\n")
+    for line in _table_lines(headers, counted(shown), col_widths):
+        out.write(line + "\n")
     
-    output += "└─" + "─┴─".join("─" * w for w in col_widths) + "─┘\n"
-    return output
+    hidden = sum(1 for _ in all_rows)
+    if hidden:
+        out.write(dim(f"… {hidden} more row(s) not shown ({written + hidden} total)") + "\n")
+    out.write("\n")
+    out.flush()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Lead normalization and the persistent contacted-leads index"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from dedup import LeadDedupIndex, normalize_lead
+
+
+class NormalizeLeadTest(unittest.TestCase):
+    def test_email_is_case_and_whitespace_insensitive(self):
+        self.assertEqual(normalize_lead("  Jane@Example.COM "), "email:jane@example.com")
+
+    def test_plus_tag_dropped_only_for_known_providers(self):
+        self.assertEqual(normalize_lead("jane+news@gmail.com"), "email:jane@gmail.com")
+        self.assertEqual(normalize_lead("jane+news@googlemail.com"), "email:jane@googlemail.com")
+        self.assertEqual(normalize_lead("sales+emea@acme.io"), "email:sales+emea@acme.io")
+        self.assertNotEqual(normalize_lead("sales+emea@acme.io"), normalize_lead("sales+apac@acme.io"))
+
+    def test_dict_leads_prefer_email_then_handle(self):
+        self.assertEqual(normalize_lead({"email": "A@B.co", "author": "x"}), "email:a@b.co")
+        self.assertEqual(normalize_lead({"author": "u/SomeUser"}), "handle:someuser")
+        self.assertEqual(normalize_lead({"handle": "@someuser"}), "handle:someuser")
+        self.assertIsNone(normalize_lead({"title": "no key"}))
+        self.assertIsNone(normalize_lead("   "))
+
+
+class LeadDedupIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "contacted")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_filter_new_suppresses_contacted_and_repeated_leads(self):
+        index = LeadDedupIndex(self.path, capacity=1000)
+        self.assertEqual(index.add_many(["jane@gmail.com", "u/bob"]), 2)
+
+        fresh, suppressed = index.filter_new(
+            ["jane+promo@gmail.com", {"author": "bob"}, "new@acme.io", "NEW@acme.io", {"title": "?"}]
+        )
+        index.close()
+
+        self.assertEqual(fresh, ["new@acme.io", {"title": "?"}])
+        self.assertEqual(suppressed, 3)
+
+    def test_bloom_is_rebuilt_from_exact_set(self):
+        index = LeadDedupIndex(self.path, capacity=1000)
+        index.add_many([f"user{i}@acme.io" for i in range(50)])
+        index.close()
+        os.remove(f"{self.path}.bloom")
+
+        index = LeadDedupIndex(self.path, capacity=1000)
+        try:
+            self.assertEqual(len(index), 50)
+            self.assertTrue(all(index.contains(f"user{i}@acme.io") for i in range(50)))
+            self.assertFalse(index.contains("user50@acme.io"))
+        finally:
+            index.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
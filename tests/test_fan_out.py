@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Chunked fan-out: chunk contents, payload size, retries and merging"""
+import os
+import sys
+import json
+import time
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from fan_out import FanOut, merge_chunk_data
+
+CONFIG = {"param": "emails", "chunk_size": 100, "max_workers": 4, "rate_limit": 0}
+
+
+def lead_params(count):
+    leads = [{"email": f"user{i}@example.com", "title": "Looking for a CRM " * 10, "score": i}
+             for i in range(count)]
+    return {"emails": [lead["email"] for lead in leads], "leads": leads,
+            "subject": "Hello", "cc": ["owner@example.com"], "names": [f"n{i}" for i in range(500)]}
+
+
+class FanOutChunkTest(unittest.TestCase):
+    def run_fan_out(self, params):
+        sent = {}
+
+        def send_chunk(chunk_params, index, total):
+            sent[index] = chunk_params
+            return {"status": "success", "data": {"sent": len(chunk_params["emails"])}}
+
+        FanOut(CONFIG).run(params, send_chunk)
+        return [sent[i] for i in sorted(sent)]
+
+    def test_aligned_lists_are_sliced_with_the_chunk(self):
+        chunks = self.run_fan_out(lead_params(250))
+
+        self.assertEqual([len(c["emails"]) for c in chunks], [100, 100, 50])
+        for chunk in chunks:
+            self.assertEqual([lead["email"] for lead in chunk["leads"]], chunk["emails"])
+
+    def test_large_unrelated_lists_are_dropped_and_small_ones_kept(self):
+        chunk = self.run_fan_out(lead_params(250))[0]
+
+        self.assertNotIn("names", chunk)
+        self.assertEqual(chunk["cc"], ["owner@example.com"])
+        self.assertEqual(chunk["subject"], "Hello")
+
+    def test_chunk_payloads_add_up_to_the_single_request(self):
+        params = lead_params(3000)
+        chunks = self.run_fan_out(params)
+
+        single = len(json.dumps(params))
+        sizes = [len(json.dumps(c)) for c in chunks]
+        self.assertEqual(len(chunks), 30)
+        self.assertLess(max(sizes), single / 20)
+        self.assertLess(sum(sizes), single * 1.1)
+
+
+class FanOutRetryTest(unittest.TestCase):
+    def run_flaky(self, failures, config=None):
+        """Chunk i fails with `failures[i]` (a result dict) on its first attempt only"""
+        calls = []
+        lock = threading.Lock()
+
+        def send_chunk(chunk_params, index, total):
+            with lock:
+                calls.append((index, time.monotonic()))
+                first = sum(1 for i, _ in calls if i == index) == 1
+            if first and index in failures:
+                return dict(failures[index])
+            return {"status": "success", "data": {"sent": len(chunk_params["emails"]), "ids": [index]}}
+
+        params = {"emails": [f"u{i}@example.com" for i in range(450)]}
+        results = FanOut({**CONFIG, "retry_backoff": 0.05, **(config or {})}).run(params, send_chunk)
+        return results, calls
+
+    def test_only_failed_chunks_are_retried(self):
+        results, calls = self.run_flaky({2: {"status": "error", "message": "502", "retryable": True}})
+
+        self.assertEqual(sorted(i for i, _ in calls), [0, 1, 2, 2, 3, 4])
+        self.assertEqual([r["attempts"] for r in results], [1, 1, 2, 1, 1])
+        self.assertTrue(all(r["result"]["status"] == "success" for r in results))
+
+    def test_accepted_chunks_are_not_resent(self):
+        results, calls = self.run_flaky({1: {"status": "error", "message": "Response validation failed",
+                                             "delivered": True}})
+
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(results[1]["result"]["status"], "error")
+
+    def test_partial_failure_stops_after_max_retries(self):
+        def send_chunk(chunk_params, index, total):
+            if index == 4:
+                return {"status": "error", "message": "timeout", "retryable": True}
+            return {"status": "success", "data": {"sent": 100}}
+
+        params = {"emails": [f"u{i}@example.com" for i in range(450)]}
+        results = FanOut({**CONFIG, "max_retries": 2, "retry_backoff": 0}).run(params, send_chunk)
+
+        self.assertEqual([r["attempts"] for r in results], [1, 1, 1, 1, 3])
+        self.assertEqual([r["result"]["status"] for r in results].count("error"), 1)
+
+    def test_retry_passes_back_off(self):
+        failures = {0: {"status": "error", "message": "503", "retryable": True}}
+        _, calls = self.run_flaky(failures, {"retry_backoff": 0.2})
+
+        first, retry = [t for i, t in calls if i == 0]
+        self.assertGreaterEqual(retry - first, 0.2)
+
+    def test_merge_concatenates_lists_and_sums_numbers(self):
+        results, _ = self.run_flaky({3: {"status": "error", "message": "bad gateway"}})
+
+        merged = merge_chunk_data(results)
+        self.assertEqual(merged["sent"], 350)
+        self.assertEqual(merged["ids"], [0, 1, 2, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Provisioning against the in-memory n8n mock (scripts/mock_n8n.py)"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import mock_n8n
+from n8n_api import N8nAPI
+
+AUTOMATIONS = {
+    "bulk_email": {
+        "description": "Send bulk emails to multiple recipients",
+        "webhook_path": "/webhook/bulk-email",
+    },
+    "reddit_leads": {
+        "description": "Find leads from Reddit posts",
+        "webhook_path": "/webhook/reddit-leads",
+    },
+}
+
+
+class ProvisionTest(unittest.TestCase):
+    def setUp(self):
+        self.server, self.state = mock_n8n.serve(0)
+        env = {"N8N_BASE_URL": f"http://127.0.0.1:{self.server.server_port}", "N8N_API_KEY": "test"}
+        with mock.patch.dict(os.environ, env):
+            self.api = N8nAPI()
+        self.automations = {name: dict(data) for name, data in AUTOMATIONS.items()}
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def actions(self, results):
+        return {a["automation"]: a["action"] for a in results}
+
+    def test_first_run_creates_and_activates(self):
+        results = self.api.provision(self.automations)
+
+        self.assertEqual(self.actions(results), {"bulk_email": "create", "reddit_leads": "create"})
+        self.assertTrue(all(a["status"] == "ok" for a in results))
+        workflows = {w["name"]: w for w in self.state.workflows.values()}
+        self.assertEqual(set(workflows), set(AUTOMATIONS))
+        self.assertTrue(all(w["active"] for w in workflows.values()))
+
+    def test_rerun_makes_no_writes(self):
+        self.api.provision(self.automations)
+        writes = self.state.writes
+
+        results = self.api.provision(self.automations)
+
+        self.assertEqual(set(self.actions(results).values()), {"unchanged"})
+        self.assertEqual(self.state.writes, writes)
+
+    def test_changed_description_updates_workflow(self):
+        self.api.provision(self.automations)
+        writes = self.state.writes
+        self.automations["bulk_email"]["description"] = "Send personalized bulk emails"
+
+        results = self.api.provision(self.automations)
+
+        self.assertEqual(self.actions(results), {"bulk_email": "update", "reddit_leads": "unchanged"})
+        self.assertEqual(self.state.writes, writes + 1)
+        workflow = next(w for w in self.state.workflows.values() if w["name"] == "bulk_email")
+        notes = [n["parameters"]["content"] for n in workflow["nodes"] if n["name"] == "Description"]
+        self.assertEqual(notes, ["Send personalized bulk emails"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Table rendering: fixed frame widths and no lost data"""
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from styling import ANSI_RE, TABLE_SAMPLE_ROWS, display_width, stream_table, table
+
+
+def render(rows, **kwargs):
+    out = io.StringIO()
+    stream_table(["ID", "Name"], rows, out=out, max_rows=None, **kwargs)
+    return [line for line in out.getvalue().splitlines() if line]
+
+
+def cell_text(lines, column):
+    """Concatenate one column's text over all body lines (continuations included)"""
+    body = [line for line in lines[3:-1] if line.startswith("│")]
+    return "".join(ANSI_RE.sub("", line).split("│")[column + 1].strip() for line in body)
+
+
+class StreamTableTest(unittest.TestCase):
+    def test_frame_stays_aligned_past_the_sample(self):
+        rows = [[str(i), "x" * (i // 50)] for i in range(TABLE_SAMPLE_ROWS + 5)]
+        lines = render(rows)
+
+        widths = {display_width(line) for line in lines}
+        self.assertEqual(len(widths), 1, lines[-8:])
+
+    def test_wide_cells_after_the_sample_are_wrapped_not_cut(self):
+        rows = [[str(i), "n"] for i in range(TABLE_SAMPLE_ROWS)] + [["123456789", "n"]]
+        lines = render(rows)
+
+        self.assertNotIn("…", "".join(lines))
+        self.assertTrue(cell_text(lines, 0).endswith("123456789"))
+
+    def test_table_is_not_capped(self):
+        value = "y" * 120
+        self.assertIn(value, table(["A"], [[value]]))
+
+
+if __name__ == "__main__":
+    unittest.main()